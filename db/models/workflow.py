@@ -35,6 +35,7 @@ class WorkflowType(Enum):
     CONDITIONAL = "conditional"
     LOOP = "loop"
     PIPELINE = "pipeline"
+    MULTI_AGENT = "multi_agent"
 
     # Business workflows
     DATA_PROCESSING = "data_processing"
@@ -12,18 +12,107 @@ Features:
 - Support for complex relationships
 """
 
+from __future__ import annotations
+
+import functools
+import importlib
+import types
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Union
 from dataclasses import dataclass, field
 
-from agentical.db.models.user import User, Role
-from agentical.db.models.agent import Agent, AgentType, AgentStatus
-from agentical.db.models.playbook import (
-    Playbook, PlaybookStep, PlaybookExecution, PlaybookStatus,
-    ExecutionStatus, StepType, StepStatus, PlaybookCategory
-)
-from agentical.db.models.workflow import Workflow, WorkflowExecution, WorkflowStep
+if TYPE_CHECKING:
+    from agentical.db.models.user import User, Role
+    from agentical.db.models.agent import Agent, AgentType, AgentStatus
+    from agentical.db.models.playbook import (
+        Playbook, PlaybookStep, PlaybookExecution, PlaybookStatus,
+        ExecutionStatus, StepType, StepStatus, PlaybookCategory
+    )
+    from agentical.db.models.workflow import Workflow, WorkflowExecution, WorkflowStep
+
+
+# Shared read-only default for configuration dicts; never mutated, thawed to a
+# fresh dict only where a value is handed to a model.
+_EMPTY = types.MappingProxyType({})
+
+
+def _thaw(value: Any) -> Any:
+    return {} if value is _EMPTY else value
+
+
+@functools.lru_cache(maxsize=None)
+def _models(name: str):
+    """Import an ``agentical.db.models`` submodule on first build, not at module load."""
+    return importlib.import_module(f"agentical.db.models.{name}")
+
+
+@functools.lru_cache(maxsize=256)
+def _display_name(first_name: str, last_name: str) -> str:
+    return f"{first_name} {last_name}"
+
+
+def _setter(attr: str, doc: str):
+    """Build a fluent setter that stores its argument on ``attr`` and returns the builder."""
+    def setter(self, value):
+        setattr(self, attr, value)
+        return self
+    setter.__doc__ = doc
+    return setter
+
+
+def _resolve(enum_cls, value):
+    """Resolve an enum member name deferred by ``reset()``; members pass through."""
+    return enum_cls[value] if isinstance(value, str) else value
+
+
+class _Record:
+    """Slotted record for builder sub-entities; converted to a dict only in ``build()``."""
+
+    __slots__ = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: _thaw(getattr(self, name)) for name in self.__slots__}
+
+
+@dataclass
+class _Step(_Record):
+    __slots__ = ("step_id", "name", "step_type", "configuration", "order")
+    step_id: str
+    name: str
+    step_type: Any
+    configuration: Dict[str, Any]
+    order: int
+
+
+@dataclass
+class _Trigger(_Record):
+    __slots__ = ("trigger_id", "trigger_type", "configuration")
+    trigger_id: str
+    trigger_type: str
+    configuration: Dict[str, Any]
+
+
+@dataclass
+class _Variable(_Record):
+    __slots__ = ("value", "type")
+    value: Any
+    type: str
+
+
+@dataclass
+class _StepExecution(_Record):
+    __slots__ = ("step_execution_id", "step_id", "status", "started_at", "completed_at")
+    step_execution_id: str
+    step_id: str
+    status: Any
+    started_at: datetime
+    completed_at: Optional[datetime]
+
+
+def _plain(value: Any) -> Any:
+    """Convert a record to its dict form, leaving caller-supplied dicts untouched."""
+    return value.as_dict() if isinstance(value, _Record) else value
 
 
 class UserBuilder:
@@ -43,26 +132,16 @@ class UserBuilder:
         self._is_verified = True
         self._is_admin = False
         self._roles = []
+        self._has_admin_role = False
         self._created_at = datetime.utcnow()
         self._last_login = None
         self._account_locked = False
         self._failed_attempts = 0
         return self
 
-    def username(self, username: str):
-        """Set username."""
-        self._username = username
-        return self
-
-    def email(self, email: str):
-        """Set email address."""
-        self._email = email
-        return self
-
-    def password(self, password: str):
-        """Set password hash."""
-        self._password = password
-        return self
+    username = _setter("_username", "Set username.")
+    email = _setter("_email", "Set email address.")
+    password = _setter("_password", "Set password hash.")
 
     def name(self, first_name: str, last_name: str = None):
         """Set first and last name."""
@@ -71,10 +150,7 @@ class UserBuilder:
             self._last_name = last_name
         return self
 
-    def display_name(self, display_name: str):
-        """Set display name."""
-        self._display_name = display_name
-        return self
+    display_name = _setter("_display_name", "Set display name.")
 
     def verified(self, is_verified: bool = True):
         """Set verification status."""
@@ -87,25 +163,32 @@ class UserBuilder:
         return self
 
     def with_roles(self, *roles: Union[str, Role]):
-        """Add roles to user."""
+        """Add roles to user, each given as a name or a Role object."""
         for role in roles:
             if isinstance(role, str):
-                role_obj = Role(name=role, description=f"{role} role")
-                self._roles.append(role_obj)
+                self.with_role_names(role)
             else:
-                self._roles.append(role)
+                self.with_role_objects(role)
         return self
 
-    def created_at(self, created_at: datetime):
-        """Set creation timestamp."""
-        self._created_at = created_at
+    def with_role_names(self, *names: str):
+        """Add roles to user by name."""
+        role_cls = _models("user").Role
+        self._roles.extend(role_cls(name=name, description=f"{name} role") for name in names)
+        if "admin" in names:
+            self._has_admin_role = True
         return self
 
-    def last_login(self, last_login: datetime):
-        """Set last login timestamp."""
-        self._last_login = last_login
+    def with_role_objects(self, *roles: Role):
+        """Add existing Role objects to user."""
+        self._roles.extend(roles)
+        if any(role.name == "admin" for role in roles):
+            self._has_admin_role = True
         return self
 
+    created_at = _setter("_created_at", "Set creation timestamp.")
+    last_login = _setter("_last_login", "Set last login timestamp.")
+
     def locked(self, is_locked: bool = True, failed_attempts: int = 5):
         """Set account locked status."""
         self._account_locked = is_locked
@@ -114,9 +197,9 @@ class UserBuilder:
 
     def build(self) -> User:
         """Build the user instance."""
-        display_name = self._display_name or f"{self._first_name} {self._last_name}"
+        display_name = self._display_name or _display_name(self._first_name, self._last_name)
 
-        user = User(
+        user = _models("user").User(
             username=self._username,
             email=self._email,
             hashed_password=self._password,
@@ -131,9 +214,10 @@ class UserBuilder:
         )
 
         # Add roles
-        if self._is_admin and not any(role.name == "admin" for role in self._roles):
-            admin_role = Role(name="admin", description="Administrator role")
+        if self._is_admin and not self._has_admin_role:
+            admin_role = _models("user").Role(name="admin", description="Administrator role")
             self._roles.append(admin_role)
+            self._has_admin_role = True
 
         user.roles = self._roles
         return user
@@ -150,104 +234,80 @@ class AgentBuilder:
         self._agent_id = str(uuid.uuid4())
         self._name = f"agent_{uuid.uuid4().hex[:8]}"
         self._description = "Test agent for automated testing"
-        self._agent_type = AgentType.CODE_AGENT
-        self._status = AgentStatus.ACTIVE
-        self._configuration = {}
+        self._agent_type = "CODE_AGENT"
+        self._status = "ACTIVE"
+        self._configuration = _EMPTY
+        self._dirty = False
         self._capabilities = ["test_capability"]
+        self._capabilities_set = {"test_capability"}
         self._tools = []
+        self._tools_set = set()
         self._created_at = datetime.utcnow()
         self._updated_at = None
         self._version = "1.0.0"
         self._owner_id = None
         return self
 
-    def agent_id(self, agent_id: str):
-        """Set agent ID."""
-        self._agent_id = agent_id
-        return self
-
-    def name(self, name: str):
-        """Set agent name."""
-        self._name = name
-        return self
-
-    def description(self, description: str):
-        """Set agent description."""
-        self._description = description
-        return self
-
-    def agent_type(self, agent_type: AgentType):
-        """Set agent type."""
-        self._agent_type = agent_type
-        return self
-
-    def status(self, status: AgentStatus):
-        """Set agent status."""
-        self._status = status
-        return self
+    agent_id = _setter("_agent_id", "Set agent ID.")
+    name = _setter("_name", "Set agent name.")
+    description = _setter("_description", "Set agent description.")
+    agent_type = _setter("_agent_type", "Set agent type.")
+    status = _setter("_status", "Set agent status.")
 
     def configuration(self, config: Dict[str, Any]):
         """Set agent configuration."""
         self._configuration = config
+        self._dirty = True
         return self
 
     def add_capability(self, capability: str):
         """Add capability to agent."""
-        if capability not in self._capabilities:
+        if capability not in self._capabilities_set:
+            self._capabilities_set.add(capability)
             self._capabilities.append(capability)
         return self
 
     def with_capabilities(self, *capabilities: str):
         """Set agent capabilities."""
         self._capabilities = list(capabilities)
+        self._capabilities_set = set(capabilities)
         return self
 
     def add_tool(self, tool: str):
         """Add tool to agent."""
-        if tool not in self._tools:
+        if tool not in self._tools_set:
+            self._tools_set.add(tool)
             self._tools.append(tool)
         return self
 
     def with_tools(self, *tools: str):
         """Set agent tools."""
         self._tools = list(tools)
+        self._tools_set = set(tools)
         return self
 
-    def version(self, version: str):
-        """Set agent version."""
-        self._version = version
-        return self
-
-    def owner(self, owner_id: int):
-        """Set agent owner."""
-        self._owner_id = owner_id
-        return self
-
-    def created_at(self, created_at: datetime):
-        """Set creation timestamp."""
-        self._created_at = created_at
-        return self
-
-    def updated_at(self, updated_at: datetime):
-        """Set update timestamp."""
-        self._updated_at = updated_at
-        return self
+    version = _setter("_version", "Set agent version.")
+    owner = _setter("_owner_id", "Set agent owner.")
+    created_at = _setter("_created_at", "Set creation timestamp.")
+    updated_at = _setter("_updated_at", "Set update timestamp.")
 
     def build(self) -> Agent:
         """Build the agent instance."""
-        config = self._configuration.copy()
-        config.update({
+        config = {
             "capabilities": self._capabilities,
             "tools": self._tools,
             "version": self._version
-        })
+        }
+        if self._dirty:
+            config = {**self._configuration, **config}
 
-        return Agent(
+        agent_models = _models("agent")
+        return agent_models.Agent(
             agent_id=self._agent_id,
             name=self._name,
             description=self._description,
-            agent_type=self._agent_type,
-            status=self._status,
+            agent_type=_resolve(agent_models.AgentType, self._agent_type),
+            status=_resolve(agent_models.AgentStatus, self._status),
             configuration=config,
             created_at=self._created_at,
             updated_at=self._updated_at,
@@ -266,11 +326,13 @@ class PlaybookBuilder:
         self._playbook_id = str(uuid.uuid4())
         self._name = f"playbook_{uuid.uuid4().hex[:8]}"
         self._description = "Test playbook for automated testing"
-        self._category = PlaybookCategory.AUTOMATION
-        self._status = PlaybookStatus.DRAFT
+        self._category = "AUTOMATION"
+        self._status = "DRAFT"
         self._version = "1.0.0"
         self._tags = ["test"]
-        self._configuration = {}
+        self._tags_set = {"test"}
+        self._configuration = _EMPTY
+        self._dirty = False
         self._steps = []
         self._variables = {}
         self._created_at = datetime.utcnow()
@@ -278,111 +340,69 @@ class PlaybookBuilder:
         self._author_id = None
         return self
 
-    def playbook_id(self, playbook_id: str):
-        """Set playbook ID."""
-        self._playbook_id = playbook_id
-        return self
-
-    def name(self, name: str):
-        """Set playbook name."""
-        self._name = name
-        return self
-
-    def description(self, description: str):
-        """Set playbook description."""
-        self._description = description
-        return self
-
-    def category(self, category: PlaybookCategory):
-        """Set playbook category."""
-        self._category = category
-        return self
-
-    def status(self, status: PlaybookStatus):
-        """Set playbook status."""
-        self._status = status
-        return self
-
-    def version(self, version: str):
-        """Set playbook version."""
-        self._version = version
-        return self
+    playbook_id = _setter("_playbook_id", "Set playbook ID.")
+    name = _setter("_name", "Set playbook name.")
+    description = _setter("_description", "Set playbook description.")
+    category = _setter("_category", "Set playbook category.")
+    status = _setter("_status", "Set playbook status.")
+    version = _setter("_version", "Set playbook version.")
 
     def add_tag(self, tag: str):
         """Add tag to playbook."""
-        if tag not in self._tags:
+        if tag not in self._tags_set:
+            self._tags_set.add(tag)
             self._tags.append(tag)
         return self
 
     def with_tags(self, *tags: str):
         """Set playbook tags."""
         self._tags = list(tags)
+        self._tags_set = set(tags)
         return self
 
     def configuration(self, config: Dict[str, Any]):
         """Set playbook configuration."""
         self._configuration = config
+        self._dirty = True
         return self
 
     def add_step(self, step_type: StepType, name: str, configuration: Dict[str, Any] = None):
         """Add step to playbook."""
-        step = {
-            "step_id": str(uuid.uuid4()),
-            "name": name,
-            "step_type": step_type,
-            "configuration": configuration or {},
-            "order": len(self._steps) + 1
-        }
-        self._steps.append(step)
+        if configuration is None:
+            configuration = _EMPTY
+        self._steps.append(
+            _Step(str(uuid.uuid4()), name, step_type, configuration, len(self._steps) + 1)
+        )
         return self
 
-    def with_steps(self, steps: List[Dict[str, Any]]):
-        """Set playbook steps."""
-        self._steps = steps
-        return self
+    with_steps = _setter("_steps", "Set playbook steps.")
 
     def add_variable(self, name: str, value: Any, variable_type: str = "string"):
         """Add variable to playbook."""
-        self._variables[name] = {
-            "value": value,
-            "type": variable_type
-        }
-        return self
-
-    def with_variables(self, variables: Dict[str, Any]):
-        """Set playbook variables."""
-        self._variables = variables
-        return self
-
-    def author(self, author_id: int):
-        """Set playbook author."""
-        self._author_id = author_id
-        return self
-
-    def created_at(self, created_at: datetime):
-        """Set creation timestamp."""
-        self._created_at = created_at
+        self._variables[name] = _Variable(value, variable_type)
         return self
 
-    def updated_at(self, updated_at: datetime):
-        """Set update timestamp."""
-        self._updated_at = updated_at
-        return self
+    with_variables = _setter("_variables", "Set playbook variables.")
+    author = _setter("_author_id", "Set playbook author.")
+    created_at = _setter("_created_at", "Set creation timestamp.")
+    updated_at = _setter("_updated_at", "Set update timestamp.")
 
     def build(self) -> Playbook:
         """Build the playbook instance."""
-        config = self._configuration.copy()
-        config.update({
-            "steps": self._steps,
-            "variables": self._variables
-        })
+        config = {
+            "steps": [_plain(step) for step in self._steps],
+            "variables": {name: _plain(var) for name, var in self._variables.items()}
+        }
+        if self._dirty:
+            config = {**self._configuration, **config}
 
-        return Playbook(
+        playbook_models = _models("playbook")
+        return playbook_models.Playbook(
             playbook_id=self._playbook_id,
             name=self._name,
             description=self._description,
-            category=self._category,
-            status=self._status,
+            category=_resolve(playbook_models.PlaybookCategory, self._category),
+            status=_resolve(playbook_models.PlaybookStatus, self._status),
             version=self._version,
             tags=self._tags,
             configuration=config,
@@ -404,7 +424,8 @@ class WorkflowBuilder:
         self._name = f"workflow_{uuid.uuid4().hex[:8]}"
         self._description = "Test workflow for automated testing"
         self._workflow_type = "sequential"
-        self._configuration = {}
+        self._configuration = _EMPTY
+        self._dirty = False
         self._steps = []
         self._triggers = []
         self._created_at = datetime.utcnow()
@@ -413,92 +434,56 @@ class WorkflowBuilder:
         self._is_active = True
         return self
 
-    def workflow_id(self, workflow_id: str):
-        """Set workflow ID."""
-        self._workflow_id = workflow_id
-        return self
-
-    def name(self, name: str):
-        """Set workflow name."""
-        self._name = name
-        return self
-
-    def description(self, description: str):
-        """Set workflow description."""
-        self._description = description
-        return self
-
-    def workflow_type(self, workflow_type: str):
-        """Set workflow type."""
-        self._workflow_type = workflow_type
-        return self
+    workflow_id = _setter("_workflow_id", "Set workflow ID.")
+    name = _setter("_name", "Set workflow name.")
+    description = _setter("_description", "Set workflow description.")
+    workflow_type = _setter("_workflow_type", "Set workflow type.")
 
     def configuration(self, config: Dict[str, Any]):
         """Set workflow configuration."""
         self._configuration = config
+        self._dirty = True
         return self
 
     def add_step(self, name: str, step_type: str, configuration: Dict[str, Any] = None):
         """Add step to workflow."""
-        step = {
-            "step_id": str(uuid.uuid4()),
-            "name": name,
-            "step_type": step_type,
-            "configuration": configuration or {},
-            "order": len(self._steps) + 1
-        }
-        self._steps.append(step)
+        if configuration is None:
+            configuration = _EMPTY
+        self._steps.append(
+            _Step(str(uuid.uuid4()), name, step_type, configuration, len(self._steps) + 1)
+        )
         return self
 
-    def with_steps(self, steps: List[Dict[str, Any]]):
-        """Set workflow steps."""
-        self._steps = steps
-        return self
+    with_steps = _setter("_steps", "Set workflow steps.")
 
     def add_trigger(self, trigger_type: str, configuration: Dict[str, Any] = None):
         """Add trigger to workflow."""
-        trigger = {
-            "trigger_id": str(uuid.uuid4()),
-            "trigger_type": trigger_type,
-            "configuration": configuration or {}
-        }
-        self._triggers.append(trigger)
+        if configuration is None:
+            configuration = _EMPTY
+        self._triggers.append(_Trigger(str(uuid.uuid4()), trigger_type, configuration))
         return self
 
-    def with_triggers(self, triggers: List[Dict[str, Any]]):
-        """Set workflow triggers."""
-        self._triggers = triggers
-        return self
-
-    def author(self, author_id: int):
-        """Set workflow author."""
-        self._author_id = author_id
-        return self
+    with_triggers = _setter("_triggers", "Set workflow triggers.")
+    author = _setter("_author_id", "Set workflow author.")
 
     def active(self, is_active: bool = True):
         """Set workflow active status."""
         self._is_active = is_active
         return self
 
-    def created_at(self, created_at: datetime):
-        """Set creation timestamp."""
-        self._created_at = created_at
-        return self
-
-    def updated_at(self, updated_at: datetime):
-        """Set update timestamp."""
-        self._updated_at = updated_at
-        return self
+    created_at = _setter("_created_at", "Set creation timestamp.")
+    updated_at = _setter("_updated_at", "Set update timestamp.")
 
     def build(self) -> Workflow:
         """Build the workflow instance."""
-        config = self._configuration.copy()
-        config.update({
-            "steps": self._steps,
-            "triggers": self._triggers
-        })
+        config = {
+            "steps": [_plain(step) for step in self._steps],
+            "triggers": [_plain(trigger) for trigger in self._triggers]
+        }
+        if self._dirty:
+            config = {**self._configuration, **config}
 
-        return Workflow(
+        return _models("workflow").Workflow(
             workflow_id=self._workflow_id,
             name=self._name,
             description=self._description,
@@ -522,10 +507,10 @@ class ExecutionBuilder:
         self._execution_id = str(uuid.uuid4())
         self._playbook_id = None
         self._workflow_id = None
-        self._status = ExecutionStatus.PENDING
+        self._status = "PENDING"
         self._started_at = None
         self._completed_at = None
-        self._configuration = {}
+        self._configuration = _EMPTY
         self._input_data = {}
         self._output_data = {}
         self._error_message = None
@@ -534,76 +519,34 @@ class ExecutionBuilder:
         self._triggered_by = None
         return self
 
-    def execution_id(self, execution_id: str):
-        """Set execution ID."""
-        self._execution_id = execution_id
-        return self
-
-    def playbook(self, playbook_id: str):
-        """Set playbook ID."""
-        self._playbook_id = playbook_id
-        return self
-
-    def workflow(self, workflow_id: str):
-        """Set workflow ID."""
-        self._workflow_id = workflow_id
-        return self
-
-    def status(self, status: ExecutionStatus):
-        """Set execution status."""
-        self._status = status
-        return self
-
-    def started_at(self, started_at: datetime):
-        """Set start timestamp."""
-        self._started_at = started_at
-        return self
-
-    def completed_at(self, completed_at: datetime):
-        """Set completion timestamp."""
-        self._completed_at = completed_at
-        return self
-
-    def configuration(self, config: Dict[str, Any]):
-        """Set execution configuration."""
-        self._configuration = config
-        return self
-
-    def input_data(self, input_data: Dict[str, Any]):
-        """Set input data."""
-        self._input_data = input_data
-        return self
-
-    def output_data(self, output_data: Dict[str, Any]):
-        """Set output data."""
-        self._output_data = output_data
-        return self
-
-    def error_message(self, error_message: str):
-        """Set error message."""
-        self._error_message = error_message
-        return self
+    execution_id = _setter("_execution_id", "Set execution ID.")
+    playbook = _setter("_playbook_id", "Set playbook ID.")
+    workflow = _setter("_workflow_id", "Set workflow ID.")
+    status = _setter("_status", "Set execution status.")
+    started_at = _setter("_started_at", "Set start timestamp.")
+    completed_at = _setter("_completed_at", "Set completion timestamp.")
+    configuration = _setter("_configuration", "Set execution configuration.")
+    input_data = _setter("_input_data", "Set input data.")
+    output_data = _setter("_output_data", "Set output data.")
+    error_message = _setter("_error_message", "Set error message.")
 
     def progress(self, progress: int):
         """Set execution progress (0-100)."""
-        self._progress = max(0, min(100, progress))
+        self._progress = 0 if progress < 0 else 100 if progress > 100 else progress
         return self
 
-    def triggered_by(self, triggered_by: str):
-        """Set who/what triggered the execution."""
-        self._triggered_by = triggered_by
-        return self
+    triggered_by = _setter("_triggered_by", "Set who/what triggered the execution.")
 
     def add_step_execution(self, step_id: str, status: StepStatus, started_at: datetime = None):
         """Add step execution."""
-        step_execution = {
-            "step_execution_id": str(uuid.uuid4()),
-            "step_id": step_id,
-            "status": status,
-            "started_at": started_at or datetime.utcnow(),
-            "completed_at": None if status in [StepStatus.PENDING, StepStatus.RUNNING] else datetime.utcnow()
-        }
-        self._step_executions.append(step_execution)
+        StepStatus = _models("playbook").StepStatus
+        self._step_executions.append(_StepExecution(
+            str(uuid.uuid4()),
+            step_id,
+            status,
+            started_at or datetime.utcnow(),
+            None if status in [StepStatus.PENDING, StepStatus.RUNNING] else datetime.utcnow()
+        ))
         return self
 
     def build_playbook_execution(self) -> PlaybookExecution:
@@ -611,13 +554,14 @@ class ExecutionBuilder:
         if not self._playbook_id:
             raise ValueError("Playbook ID is required for playbook execution")
 
-        return PlaybookExecution(
+        playbook_models = _models("playbook")
+        return playbook_models.PlaybookExecution(
             execution_id=self._execution_id,
             playbook_id=self._playbook_id,
-            status=self._status,
+            status=_resolve(playbook_models.ExecutionStatus, self._status),
             started_at=self._started_at,
             completed_at=self._completed_at,
-            configuration=self._configuration,
+            configuration=_thaw(self._configuration),
             input_data=self._input_data,
             output_data=self._output_data,
             error_message=self._error_message,
@@ -630,13 +574,13 @@ class ExecutionBuilder:
         if not self._workflow_id:
             raise ValueError("Workflow ID is required for workflow execution")
 
-        return WorkflowExecution(
+        return _models("workflow").WorkflowExecution(
             execution_id=self._execution_id,
             workflow_id=self._workflow_id,
-            status=self._status,
+            status=_resolve(_models("playbook").ExecutionStatus, self._status),
             started_at=self._started_at,
             completed_at=self._completed_at,
-            configuration=self._configuration,
+            configuration=_thaw(self._configuration),
             input_data=self._input_data,
             output_data=self._output_data,
             error_message=self._error_message,
@@ -646,38 +590,43 @@ class ExecutionBuilder:
 
 
 # Convenience functions for common scenarios
+_BUILDER_MAP = {
+    "user": UserBuilder,
+    "agent": AgentBuilder,
+    "playbook": PlaybookBuilder,
+    "workflow": WorkflowBuilder,
+}
+
+
+def create_test(kind: str, **setters: Any):
+    """Create a test entity of the given kind, applying each keyword as a builder setter."""
+    builder = _BUILDER_MAP[kind]()
+    for setter, value in setters.items():
+        getattr(builder, setter)(value)
+    return builder.build()
+
+
 def create_test_user(username: str = None, is_admin: bool = False) -> User:
     """Create a simple test user."""
-    builder = UserBuilder()
-    if username:
-        builder.username(username)
+    setters = {"username": username} if username else {}
     if is_admin:
-        builder.admin(True)
-    return builder.build()
+        setters["admin"] = True
+    return create_test("user", **setters)
 
 
-def create_test_agent(name: str = None, agent_type: AgentType = AgentType.CODE_AGENT) -> Agent:
+def create_test_agent(name: str = None, agent_type: Union[AgentType, str] = "CODE_AGENT") -> Agent:
     """Create a simple test agent."""
-    builder = AgentBuilder()
-    if name:
-        builder.name(name)
-    builder.agent_type(agent_type)
-    return builder.build()
+    setters = {"name": name} if name else {}
+    return create_test("agent", agent_type=agent_type, **setters)
 
 
-def create_test_playbook(name: str = None, category: PlaybookCategory = PlaybookCategory.AUTOMATION) -> Playbook:
+def create_test_playbook(name: str = None, category: Union[PlaybookCategory, str] = "AUTOMATION") -> Playbook:
     """Create a simple test playbook."""
-    builder = PlaybookBuilder()
-    if name:
-        builder.name(name)
-    builder.category(category)
-    return builder.build()
+    setters = {"name": name} if name else {}
+    return create_test("playbook", category=category, **setters)
 
 
 def create_test_workflow(name: str = None, workflow_type: str = "sequential") -> Workflow:
     """Create a simple test workflow."""
-    builder = WorkflowBuilder()
-    if name:
-        builder.name(name)
-    builder.workflow_type(workflow_type)
-    return builder.build()
+    setters = {"name": name} if name else {}
+    return create_test("workflow", workflow_type=workflow_type, **setters)
@@ -7,66 +7,139 @@ system without external dependencies, focusing on core functionality.
 """
 
 import asyncio
+import contextvars
+import hashlib
+import logging
 import sys
 import os
 import time
 import traceback
+import types
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-from unittest.mock import Mock, AsyncMock
+
+log = logging.getLogger("verify")
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 print("🔍 Verifying Agent Pool Discovery Tests...")
 
+# Shared fixture values; list fields get a fresh list(...) copy per model.
+_TOOLS_MEM_FS = ("memory", "filesystem")
+_TOOLS_MEM = ("memory",)
+_TOOLS_TEST = ("test_tool",)
+_TOOLS_COMMON = ("common_tool",)
+_WORKFLOWS_SEQ = ("sequential",)
+_STEP_ACTION = ("action",)
+
+try:
+    from agents.pool_discovery import AgentPoolDiscoveryService
+    from agents.playbook_capabilities import (
+        AgentPoolEntry, PlaybookCapability, CapabilityFilter,
+        HealthStatus, PlaybookCapabilityType, CapabilityComplexity
+    )
+    from agents.capability_matcher import (
+        AdvancedCapabilityMatcher, MatchingContext, MatchingAlgorithm
+    )
+    _IMPORT_ERROR = None
+
+    # Filters and matching context are only read by the tests, so each is
+    # built once and shared.
+    _EMPTY_CTX = MatchingContext()
+    _HEALTHY_ONLY = [HealthStatus.HEALTHY]
+    _MEMORY_SEQUENTIAL_FILTER = CapabilityFilter(
+        required_tools=list(_TOOLS_MEM),
+        workflow_types=list(_WORKFLOWS_SEQ),
+        health_statuses=_HEALTHY_ONLY
+    )
+    _TEST_TOOL_FILTER = CapabilityFilter(
+        required_tools=list(_TOOLS_TEST),
+        health_statuses=_HEALTHY_ONLY
+    )
+    _COMMON_TOOL_FILTER = CapabilityFilter(
+        required_tools=list(_TOOLS_COMMON),
+        health_statuses=_HEALTHY_ONLY
+    )
+except ImportError as e:
+    _IMPORT_ERROR = e
+
+# Report lines are buffered and written once at the end of the run. Each
+# gathered test runs in its own context and so gets its own buffer, which
+# keeps a test's lines together in the final report.
+_OUT: List[str] = []
+_current_out = contextvars.ContextVar("verify_out", default=_OUT)
+
+def _log(message=""):
+    """Buffer a report line."""
+    _current_out.get().append(message)
+
+def _report_failure(what, error):
+    """Report a failure on one line; the traceback is only formatted with AGENTICAL_VERBOSE=1."""
+    _log(f"❌ {what} failed: {error}")
+    log.debug("%s failed", what, exc_info=error)
+
+def _flush_log():
+    """Write all buffered report lines in one call."""
+    if _OUT:
+        sys.stdout.write("\n".join(_OUT) + "\n")
+        sys.stdout.flush()
+        _OUT.clear()
+
+_MATCHER = None
+
+def _matcher():
+    """Return the capability matcher shared by the matching tests, creating it on first use."""
+    global _MATCHER
+    if _MATCHER is None:
+        _MATCHER = AdvancedCapabilityMatcher()
+    return _MATCHER
+
+async def _empty_agent_list(*args, **kwargs):
+    """Stand-in for ``list_agents``; the tests never inspect its calls."""
+    return []
+
+def _new_service():
+    """Create a discovery service backed by an empty mocked agent registry."""
+    service = AgentPoolDiscoveryService()
+    service.agent_registry = types.SimpleNamespace(list_agents=_empty_agent_list)
+    return service
+
+async def _make_service():
+    """Create and initialize a discovery service with an empty agent registry."""
+    service = _new_service()
+    await service.initialize()
+    return service
+
 def test_imports():
     """Test that all required modules can be imported."""
-    try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-        from agents.playbook_capabilities import (
-            AgentPoolEntry, PlaybookCapability, CapabilityFilter,
-            HealthStatus, PlaybookCapabilityType, CapabilityComplexity
-        )
-        from agents.capability_matcher import (
-            AdvancedCapabilityMatcher, MatchingContext, MatchingAlgorithm
-        )
-        print("✅ All imports successful")
-        return True
-    except ImportError as e:
-        print(f"❌ Import failed: {e}")
+    if _IMPORT_ERROR is not None:
+        _log(f"❌ Import failed: {_IMPORT_ERROR}")
         return False
+    _log("✅ All imports successful")
+    return True
 
 async def test_service_initialization():
     """Test basic service initialization."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
+        service = _new_service()
 
         success = await service.initialize()
         assert success is True
         assert hasattr(service, 'agent_pool')
         assert isinstance(service.agent_pool, dict)
 
-        print("✅ Service initialization test passed")
+        _log("✅ Service initialization test passed")
         return True
     except Exception as e:
-        print(f"❌ Service initialization test failed: {e}")
+        _report_failure("Service initialization test", e)
         return False
 
 async def test_agent_registration():
     """Test agent registration functionality."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-        from agents.playbook_capabilities import AgentPoolEntry, HealthStatus
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
-        await service.initialize()
+        service = await _make_service()
 
         # Create test agent
         test_agent = AgentPoolEntry(
@@ -75,8 +148,8 @@ async def test_agent_registration():
             agent_name="Test Verification Agent",
             description="Agent for verification testing",
             health_status=HealthStatus.HEALTHY,
-            available_tools=["memory", "filesystem"],
-            supported_workflows=["sequential"]
+            available_tools=list(_TOOLS_MEM_FS),
+            supported_workflows=list(_WORKFLOWS_SEQ)
         )
 
         # Register agent
@@ -88,22 +161,16 @@ async def test_agent_registration():
         assert retrieved.agent_id == test_agent.agent_id
         assert retrieved.agent_name == "Test Verification Agent"
 
-        print("✅ Agent registration test passed")
+        _log("✅ Agent registration test passed")
         return True
     except Exception as e:
-        print(f"❌ Agent registration test failed: {e}")
+        _report_failure("Agent registration test", e)
         return False
 
 async def test_heartbeat_updates():
     """Test heartbeat update functionality."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-        from agents.playbook_capabilities import AgentPoolEntry, HealthStatus
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
-        await service.initialize()
+        service = await _make_service()
 
         # Create and register test agent
         test_agent = AgentPoolEntry(
@@ -115,11 +182,10 @@ async def test_heartbeat_updates():
         )
         service.agent_pool[test_agent.agent_id] = test_agent
 
-        # Get initial heartbeat
+        # Backdate the initial heartbeat so the update is observable without sleeping
+        test_agent.last_heartbeat = datetime.utcnow() - timedelta(seconds=1)
         initial_heartbeat = test_agent.last_heartbeat
 
-        # Wait a moment and update heartbeat
-        await asyncio.sleep(0.01)
         success = await service.update_agent_heartbeat(test_agent.agent_id)
 
         # Verify update
@@ -127,25 +193,16 @@ async def test_heartbeat_updates():
         updated_agent = service.agent_pool[test_agent.agent_id]
         assert updated_agent.last_heartbeat > initial_heartbeat
 
-        print("✅ Heartbeat update test passed")
+        _log("✅ Heartbeat update test passed")
         return True
     except Exception as e:
-        print(f"❌ Heartbeat update test failed: {e}")
+        _report_failure("Heartbeat update test", e)
         return False
 
 async def test_capability_filtering():
     """Test capability filtering functionality."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-        from agents.playbook_capabilities import (
-            AgentPoolEntry, CapabilityFilter, HealthStatus,
-            PlaybookCapability, PlaybookCapabilityType, CapabilityComplexity
-        )
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
-        await service.initialize()
+        service = await _make_service()
 
         # Create test agent with capabilities
         test_capability = PlaybookCapability(
@@ -154,8 +211,8 @@ async def test_capability_filtering():
             description="A test capability",
             capability_type=PlaybookCapabilityType.TASK_EXECUTION,
             complexity=CapabilityComplexity.SIMPLE,
-            supported_step_types=["action"],
-            required_tools=["memory"]
+            supported_step_types=list(_STEP_ACTION),
+            required_tools=list(_TOOLS_MEM)
         )
 
         test_agent = AgentPoolEntry(
@@ -164,54 +221,47 @@ async def test_capability_filtering():
             agent_name="Capability Test Agent",
             description="Agent for capability testing",
             health_status=HealthStatus.HEALTHY,
-            available_tools=["memory", "filesystem"],
-            supported_workflows=["sequential"],
+            available_tools=list(_TOOLS_MEM_FS),
+            supported_workflows=list(_WORKFLOWS_SEQ),
             capabilities=[test_capability]
         )
         service.agent_pool[test_agent.agent_id] = test_agent
 
-        # Create filter
-        capability_filter = CapabilityFilter(
-            required_tools=["memory"],
-            workflow_types=["sequential"],
-            health_statuses=[HealthStatus.HEALTHY]
-        )
-
         # Find capable agents
-        matches = await service.find_capable_agents(capability_filter, max_results=5)
+        matches = await service.find_capable_agents(_MEMORY_SEQUENTIAL_FILTER, max_results=5)
 
         # Verify results
         assert len(matches) > 0
         assert matches[0].agent_id == test_agent.agent_id
         assert matches[0].is_viable is True
 
-        print("✅ Capability filtering test passed")
+        _log("✅ Capability filtering test passed")
         return True
     except Exception as e:
-        print(f"❌ Capability filtering test failed: {e}")
+        _report_failure("Capability filtering test", e)
         return False
 
 async def test_pool_statistics():
     """Test pool statistics generation."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-        from agents.playbook_capabilities import AgentPoolEntry, HealthStatus
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
-        await service.initialize()
+        service = await _make_service()
 
         # Add multiple test agents
-        for i in range(3):
-            agent = AgentPoolEntry(
+        agents = [
+            AgentPoolEntry(
                 agent_id=f"stats_test_agent_{i}",
-                agent_type="test" if i < 2 else "worker",
+                agent_type=agent_type,
                 agent_name=f"Stats Test Agent {i}",
                 description=f"Agent {i} for statistics testing",
-                health_status=HealthStatus.HEALTHY if i < 2 else HealthStatus.WARNING
+                health_status=health_status
             )
-            service.agent_pool[agent.agent_id] = agent
+            for i, (agent_type, health_status) in enumerate([
+                ("test", HealthStatus.HEALTHY),
+                ("test", HealthStatus.HEALTHY),
+                ("worker", HealthStatus.WARNING)
+            ])
+        ]
+        service.agent_pool.update({agent.agent_id: agent for agent in agents})
 
         # Get statistics
         stats = await service.get_pool_statistics()
@@ -228,24 +278,16 @@ async def test_pool_statistics():
         assert stats["agents_by_type"]["test"] == 2
         assert stats["agents_by_type"]["worker"] == 1
 
-        print("✅ Pool statistics test passed")
+        _log("✅ Pool statistics test passed")
         return True
     except Exception as e:
-        print(f"❌ Pool statistics test failed: {e}")
+        _report_failure("Pool statistics test", e)
         return False
 
 async def test_capability_matcher():
     """Test capability matcher functionality."""
     try:
-        from agents.capability_matcher import (
-            AdvancedCapabilityMatcher, MatchingContext, MatchingAlgorithm
-        )
-        from agents.playbook_capabilities import (
-            AgentPoolEntry, CapabilityFilter, HealthStatus,
-            PlaybookCapability, PlaybookCapabilityType, CapabilityComplexity
-        )
-
-        matcher = AdvancedCapabilityMatcher()
+        matcher = _matcher()
 
         # Create test agents
         test_capability = PlaybookCapability(
@@ -254,8 +296,8 @@ async def test_capability_matcher():
             description="Capability for matcher testing",
             capability_type=PlaybookCapabilityType.TASK_EXECUTION,
             complexity=CapabilityComplexity.SIMPLE,
-            supported_step_types=["action"],
-            required_tools=["test_tool"]
+            supported_step_types=list(_STEP_ACTION),
+            required_tools=list(_TOOLS_TEST)
         )
 
         agents = [
@@ -266,7 +308,7 @@ async def test_capability_matcher():
                 description="First matcher test agent",
                 health_status=HealthStatus.HEALTHY,
                 current_load=1,
-                available_tools=["test_tool"],
+                available_tools=list(_TOOLS_TEST),
                 capabilities=[test_capability]
             ),
             AgentPoolEntry(
@@ -276,23 +318,16 @@ async def test_capability_matcher():
                 description="Second matcher test agent",
                 health_status=HealthStatus.HEALTHY,
                 current_load=3,
-                available_tools=["test_tool"],
+                available_tools=list(_TOOLS_TEST),
                 capabilities=[test_capability]
             )
         ]
 
-        # Create requirements and context
-        requirements = CapabilityFilter(
-            required_tools=["test_tool"],
-            health_statuses=[HealthStatus.HEALTHY]
-        )
-        context = MatchingContext()
-
         # Test matching
         matches = await matcher.find_best_matches(
             agents=agents,
-            requirements=requirements,
-            context=context,
+            requirements=_TEST_TOOL_FILTER,
+            context=_EMPTY_CTX,
             algorithm=MatchingAlgorithm.WEIGHTED_SCORE,
             max_results=5
         )
@@ -302,62 +337,52 @@ async def test_capability_matcher():
         assert all(match.match_score >= 0.0 for match in matches)
         assert all(match.match_score <= 1.0 for match in matches)
 
-        print("✅ Capability matcher test passed")
+        _log("✅ Capability matcher test passed")
         return True
     except Exception as e:
-        print(f"❌ Capability matcher test failed: {e}")
+        _report_failure("Capability matcher test", e)
         return False
 
 async def test_load_balancing():
     """Test load balancing functionality."""
     try:
-        from agents.capability_matcher import (
-            AdvancedCapabilityMatcher, MatchingContext, MatchingAlgorithm
-        )
-        from agents.playbook_capabilities import (
-            AgentPoolEntry, CapabilityFilter, HealthStatus,
-            PlaybookCapability, PlaybookCapabilityType, CapabilityComplexity
-        )
-
-        matcher = AdvancedCapabilityMatcher()
+        matcher = _matcher()
 
         # Create agents with different loads
-        agents = []
-        for i in range(3):
-            capability = PlaybookCapability(
-                name=f"load_test_capability_{i}",
-                display_name=f"Load Test Capability {i}",
-                description=f"Capability {i} for load testing",
-                capability_type=PlaybookCapabilityType.TASK_EXECUTION,
-                complexity=CapabilityComplexity.SIMPLE,
-                supported_step_types=["action"],
-                required_tools=["common_tool"]
-            )
-
-            agent = AgentPoolEntry(
+        capability_base = dict(
+            capability_type=PlaybookCapabilityType.TASK_EXECUTION,
+            complexity=CapabilityComplexity.SIMPLE,
+            supported_step_types=list(_STEP_ACTION),
+            required_tools=list(_TOOLS_COMMON)
+        )
+        agent_base = dict(
+            agent_type="worker",
+            health_status=HealthStatus.HEALTHY,
+            max_concurrent_executions=5,
+            available_tools=list(_TOOLS_COMMON)
+        )
+        agents = [
+            AgentPoolEntry(
+                **agent_base,
                 agent_id=f"load_agent_{i}",
-                agent_type="worker",
                 agent_name=f"Load Agent {i}",
                 description=f"Agent {i} for load testing",
-                health_status=HealthStatus.HEALTHY,
                 current_load=i * 2,  # 0, 2, 4
-                max_concurrent_executions=5,
-                available_tools=["common_tool"],
-                capabilities=[capability]
+                capabilities=[PlaybookCapability(
+                    **capability_base,
+                    name=f"load_test_capability_{i}",
+                    display_name=f"Load Test Capability {i}",
+                    description=f"Capability {i} for load testing"
+                )]
             )
-            agents.append(agent)
-
-        requirements = CapabilityFilter(
-            required_tools=["common_tool"],
-            health_statuses=[HealthStatus.HEALTHY]
-        )
-        context = MatchingContext()
+            for i in range(3)
+        ]
 
         # Test load-balanced matching
         matches = await matcher.find_best_matches(
             agents=agents,
-            requirements=requirements,
-            context=context,
+            requirements=_COMMON_TOOL_FILTER,
+            context=_EMPTY_CTX,
             algorithm=MatchingAlgorithm.LOAD_BALANCED,
             max_results=3
         )
@@ -365,25 +390,21 @@ async def test_load_balancing():
         # Verify load balancing (agent with lowest load should be first)
         assert len(matches) >= 2
         if len(matches) >= 2:
-            first_agent = next(a for a in agents if a.agent_id == matches[0].agent_id)
-            second_agent = next(a for a in agents if a.agent_id == matches[1].agent_id)
+            agents_by_id = {agent.agent_id: agent for agent in agents}
+            first_agent = agents_by_id[matches[0].agent_id]
+            second_agent = agents_by_id[matches[1].agent_id]
             assert first_agent.current_load <= second_agent.current_load
 
-        print("✅ Load balancing test passed")
+        _log("✅ Load balancing test passed")
         return True
     except Exception as e:
-        print(f"❌ Load balancing test failed: {e}")
+        _report_failure("Load balancing test", e)
         return False
 
 async def test_error_handling():
     """Test error handling scenarios."""
     try:
-        from agents.pool_discovery import AgentPoolDiscoveryService
-
-        service = AgentPoolDiscoveryService()
-        service.agent_registry = Mock()
-        service.agent_registry.list_agents = AsyncMock(return_value=[])
-        await service.initialize()
+        service = await _make_service()
 
         # Test heartbeat update for non-existent agent
         success = await service.update_agent_heartbeat("nonexistent_agent")
@@ -397,75 +418,206 @@ async def test_error_handling():
         agent = await service.get_agent_by_id("nonexistent_agent")
         assert agent is None
 
-        print("✅ Error handling test passed")
+        _log("✅ Error handling test passed")
         return True
     except Exception as e:
-        print(f"❌ Error handling test failed: {e}")
+        _report_failure("Error handling test", e)
         return False
 
+SYNC_TESTS = [
+    ("Import Test", test_imports)
+]
+
+# Each async test builds its own service and agents, so they share no
+# state and can run concurrently.
+ASYNC_TESTS = [
+    ("Service Initialization", test_service_initialization),
+    ("Agent Registration", test_agent_registration),
+    ("Heartbeat Updates", test_heartbeat_updates),
+    ("Capability Filtering", test_capability_filtering),
+    ("Pool Statistics", test_pool_statistics),
+    ("Capability Matcher", test_capability_matcher),
+    ("Load Balancing", test_load_balancing),
+    ("Error Handling", test_error_handling)
+]
+
+async def _run_async_test(test_name, test_func):
+    """Run one async verification test, returning its result and report lines."""
+    lines = []
+    _current_out.set(lines)
+    _log(f"\n🧪 Running {test_name}...")
+    try:
+        result = bool(await test_func())
+    except Exception as e:
+        _report_failure(test_name, e)
+        result = False
+    return result, lines
+
+def _run_in_process(test_name, test_func):
+    """Process pool entry point: run one async test on a fresh event loop."""
+    return asyncio.run(_run_async_test(test_name, test_func))
+
+async def _run_async_tests_in_processes():
+    """Run the async tests across worker processes.
+
+    Process startup costs far more than the current tests themselves, so this
+    is opt-in through AGENTICAL_VERIFY_PROCESSES=1 for when tests become
+    CPU-bound.
+    """
+    loop = asyncio.get_running_loop()
+    max_workers = min(len(ASYNC_TESTS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return await asyncio.gather(*(
+            loop.run_in_executor(pool, _run_in_process, test_name, test_func)
+            for test_name, test_func in ASYNC_TESTS
+        ))
+
 async def run_verification_tests():
     """Run all verification tests."""
-    print("\n" + "="*60)
-    print("AGENT POOL DISCOVERY TEST VERIFICATION")
-    print("="*60)
-
-    start_time = time.time()
-
-    tests = [
-        ("Import Test", test_imports),
-        ("Service Initialization", test_service_initialization),
-        ("Agent Registration", test_agent_registration),
-        ("Heartbeat Updates", test_heartbeat_updates),
-        ("Capability Filtering", test_capability_filtering),
-        ("Pool Statistics", test_pool_statistics),
-        ("Capability Matcher", test_capability_matcher),
-        ("Load Balancing", test_load_balancing),
-        ("Error Handling", test_error_handling)
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running {test_name}...")
+    try:
+        return await _run_verification_tests()
+    finally:
+        _flush_log()
+
+async def _run_verification_tests():
+    _log("\n" + "="*60)
+    _log("AGENT POOL DISCOVERY TEST VERIFICATION")
+    _log("="*60)
+
+    start_ns = time.perf_counter_ns()
+
+    results = []
+
+    for test_name, test_func in SYNC_TESTS:
+        _log(f"\n🧪 Running {test_name}...")
         try:
-            if asyncio.iscoroutinefunction(test_func):
-                result = await test_func()
-            else:
-                result = test_func()
-
-            if result:
-                passed += 1
-            else:
-                failed += 1
+            results.append(bool(test_func()))
         except Exception as e:
-            print(f"❌ {test_name} failed with exception: {e}")
-            failed += 1
-
-    end_time = time.time()
-    duration = end_time - start_time
-
-    print("\n" + "="*60)
-    print("VERIFICATION SUMMARY")
-    print("="*60)
-    print(f"Total Tests: {passed + failed}")
-    print(f"Passed: {passed} ✅")
-    print(f"Failed: {failed} ❌")
-    print(f"Success Rate: {passed / (passed + failed) * 100:.1f}%")
-    print(f"Duration: {duration:.2f}s")
-    print("="*60)
+            _report_failure(test_name, e)
+            results.append(False)
+
+    if all(results):
+        if os.environ.get("AGENTICAL_VERIFY_PROCESSES") == "1":
+            outcomes = await _run_async_tests_in_processes()
+        else:
+            outcomes = await asyncio.gather(
+                *(_run_async_test(test_name, test_func) for test_name, test_func in ASYNC_TESTS)
+            )
+        for result, lines in outcomes:
+            results.append(result)
+            _OUT.extend(lines)
+    else:
+        # Every async test depends on the imports, so skip them and count them as failed
+        _log(f"\n⏭️ Skipping {len(ASYNC_TESTS)} test(s) after import failure")
+        results.extend([False] * len(ASYNC_TESTS))
+
+    passed = sum(results)
+    failed = len(results) - passed
+
+    end_ns = time.perf_counter_ns()
+    duration = (end_ns - start_ns) / 1e9
+
+    _log("\n" + "="*60)
+    _log("VERIFICATION SUMMARY")
+    _log("="*60)
+    _log(f"Total Tests: {passed + failed}")
+    _log(f"Passed: {passed} ✅")
+    _log(f"Failed: {failed} ❌")
+    _log(f"Success Rate: {passed / (passed + failed) * 100:.1f}%")
+    _log(f"Duration: {duration:.2f}s")
+    _log("="*60)
 
     if failed == 0:
-        print("🎉 All verification tests passed!")
+        _log("🎉 All verification tests passed!")
         return True
     else:
-        print(f"⚠️ {failed} test(s) failed")
+        _log(f"⚠️ {failed} test(s) failed")
         return False
 
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The verified modules import the rest of these packages, so every module in them counts
+_VERIFIED_TREES = [
+    os.path.join(_PROJECT_ROOT, "agents"),
+    os.path.join(_PROJECT_ROOT, "db", "schemas"),
+]
+_VERIFIED_DISTRIBUTIONS = ["pydantic", "logfire"]
+_CACHE_FILE = os.path.join(
+    os.path.expanduser("~"), ".cache", "agentical", "verify_agent_pool_tests.key"
+)
+
+def _verified_sources():
+    """List the script and every Python module under the verified trees."""
+    sources = [os.path.abspath(__file__)]
+    for tree in _VERIFIED_TREES:
+        for dirpath, dirnames, filenames in os.walk(tree):
+            dirnames.sort()
+            sources.extend(
+                os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith(".py")
+            )
+    return sources
+
+def _sources_key():
+    """Hash the interpreter, key dependency versions and the verified sources' mtimes and sizes."""
+    from importlib import metadata
+
+    digest = hashlib.sha1()
+    digest.update(f"{sys.executable}:{sys.version}".encode())
+    for name in _VERIFIED_DISTRIBUTIONS:
+        try:
+            version = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            version = None
+        digest.update(f"{name}=={version}".encode())
+    for path in _verified_sources():
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()
+
+def _cached_success(key):
+    """Check whether the last successful run verified these exact sources."""
+    if os.environ.get("AGENTICAL_FORCE_VERIFY") == "1":
+        return False
+    try:
+        with open(_CACHE_FILE) as f:
+            return f.read().strip() == key
+    except OSError:
+        return False
+
+def _record_success(key):
+    """Remember the verified sources; failing to write the cache is not an error."""
+    try:
+        os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+        with open(_CACHE_FILE, "w") as f:
+            f.write(key)
+    except OSError:
+        pass
+
+def _run(coro):
+    """Run a coroutine on uvloop when it is installed, else on the default loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
 def main():
     """Main entry point."""
+    verbose = os.environ.get("AGENTICAL_VERBOSE") == "1"
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.WARNING)
     try:
-        result = asyncio.run(run_verification_tests())
+        key = _sources_key()
+        if _cached_success(key):
+            print("✅ Sources unchanged since last successful verification (set AGENTICAL_FORCE_VERIFY=1 to rerun)")
+            sys.exit(0)
+
+        result = _run(run_verification_tests())
+        if result:
+            _record_success(key)
         sys.exit(0 if result else 1)
     except KeyboardInterrupt:
         print("\n❌ Tests interrupted by user")
@@ -15,8 +15,9 @@ Features:
 import asyncio
 import json
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Union, Set
+from typing import Dict, Any, List, Optional, Union, Set, Tuple, Mapping
 from enum import Enum
+from types import MappingProxyType
 from contextlib import asynccontextmanager
 import uuid
 
@@ -46,6 +47,11 @@ class ExecutionPhase(Enum):
     CLEANUP = "cleanup"
 
 
+# Freelist of released contexts reused by ExecutionContext.acquire
+_CONTEXT_POOL: List["ExecutionContext"] = []
+_CONTEXT_POOL_SIZE = 32
+
+
 class ExecutionContext:
     """
     Manages workflow execution state and coordination.
@@ -63,6 +69,36 @@ class ExecutionContext:
         config: Dict[str, Any]
     ):
         """Initialize execution context."""
+        self.reset(execution, workflow, input_data, config)
+
+    @classmethod
+    def acquire(
+        cls,
+        execution: WorkflowExecution,
+        workflow: Workflow,
+        input_data: Dict[str, Any],
+        config: Dict[str, Any]
+    ) -> "ExecutionContext":
+        """Get an execution context from the freelist, or create a new one."""
+        if cls is ExecutionContext and _CONTEXT_POOL:
+            context = _CONTEXT_POOL.pop()
+            context.reset(execution, workflow, input_data, config)
+            return context
+        return cls(execution, workflow, input_data, config)
+
+    def release(self) -> None:
+        """Return the context to the freelist once nothing else uses it."""
+        if type(self) is ExecutionContext and len(_CONTEXT_POOL) < _CONTEXT_POOL_SIZE:
+            _CONTEXT_POOL.append(self)
+
+    def reset(
+        self,
+        execution: WorkflowExecution,
+        workflow: Workflow,
+        input_data: Dict[str, Any],
+        config: Dict[str, Any]
+    ) -> None:
+        """Reset the context to a fresh state for the given execution."""
         self.execution = execution
         self.workflow = workflow
         self.input_data = input_data
@@ -80,6 +116,14 @@ class ExecutionContext:
         self.step_results: Dict[int, Any] = {}
         self.global_context: Dict[str, Any] = {}
 
+        # Read-only view of variables, rebuilt if the dict is rebound
+        self._variables_view: Optional[Mapping[str, Any]] = None
+        self._variables_view_source: Optional[Dict[str, Any]] = None
+
+        # Variables changed since the last checkpoint
+        self._dirty_variables: Set[str] = set()
+        self._removed_variables: Set[str] = set()
+
         # Step tracking
         self.current_step: Optional[WorkflowStep] = None
         self.completed_steps: Set[int] = set()
@@ -109,9 +153,19 @@ class ExecutionContext:
             input_keys=list(input_data.keys())
         )
 
+    @property
+    def variables_view(self) -> Mapping[str, Any]:
+        """Read-only live view of the variables, safe to share between agent tasks."""
+        if self._variables_view_source is not self.variables:
+            self._variables_view = MappingProxyType(self.variables)
+            self._variables_view_source = self.variables
+        return self._variables_view
+
     def set_variable(self, key: str, value: Any) -> None:
         """Set a variable in the execution context."""
         self.variables[key] = value
+        self._dirty_variables.add(key)
+        self._removed_variables.discard(key)
         logfire.debug(
             "Variable set",
             execution_id=self.execution.execution_id,
@@ -119,6 +173,12 @@ class ExecutionContext:
             value_type=type(value).__name__
         )
 
+    def update_variables(self, values: Dict[str, Any]) -> None:
+        """Set several variables in the execution context."""
+        self.variables.update(values)
+        self._dirty_variables.update(values)
+        self._removed_variables.difference_update(values)
+
     def get_variable(self, key: str, default: Any = None) -> Any:
         """Get a variable from the execution context."""
         return self.variables.get(key, default)
@@ -131,6 +191,8 @@ class ExecutionContext:
         """Remove a variable from the context."""
         if key in self.variables:
             del self.variables[key]
+            self._dirty_variables.discard(key)
+            self._removed_variables.add(key)
             logfire.debug(
                 "Variable removed",
                 execution_id=self.execution.execution_id,
@@ -217,6 +279,14 @@ class ExecutionContext:
 
         return True
 
+    def take_variable_changes(self) -> Tuple[Dict[str, Any], List[str]]:
+        """Return variables set and removed since the last call, and reset tracking."""
+        changed = {key: self.variables[key] for key in self._dirty_variables}
+        removed = list(self._removed_variables)
+        self._dirty_variables = set()
+        self._removed_variables = set()
+        return changed, removed
+
     def get_progress_percentage(self) -> float:
         """Calculate execution progress percentage."""
         total_steps = len(self.workflow.steps) if self.workflow.steps else 1
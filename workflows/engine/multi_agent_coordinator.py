@@ -17,11 +17,15 @@ Features:
 """
 
 import asyncio
+import functools
+import itertools
+import time
 import uuid
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set, Union, Callable, Tuple
-from enum import Enum
-from collections import defaultdict, deque
+from typing import Dict, Any, List, Optional, Set, Union, Callable, Tuple, Deque, Mapping
+from enum import Enum, IntEnum
+from collections import ChainMap, Counter, defaultdict, deque
 import json
 import logging
 
@@ -59,36 +63,151 @@ class CoordinationStrategy(Enum):
     ADAPTIVE = "adaptive"
 
 
-class AgentState(Enum):
+class AgentState(IntEnum):
     """Agent execution state within coordinator."""
-    IDLE = "idle"
-    ASSIGNED = "assigned"
-    EXECUTING = "executing"
-    WAITING = "waiting"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    TIMEOUT = "timeout"
+    IDLE = 0
+    ASSIGNED = 1
+    EXECUTING = 2
+    WAITING = 3
+    COMPLETED = 4
+    FAILED = 5
+    TIMEOUT = 6
+    CANCELLED = 7
 
 
-class TaskPriority(Enum):
-    """Task priority levels for agent assignment."""
-    CRITICAL = "critical"
-    HIGH = "high"
-    NORMAL = "normal"
-    LOW = "low"
-    BACKGROUND = "background"
+class TaskPriority(IntEnum):
+    """Task priority levels for agent assignment; lower values are dispatched first."""
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+    BACKGROUND = 4
+
+
+# Eager task start (Python 3.12+): coroutines that finish without suspending
+# complete inside task creation instead of waiting for a loop iteration
+_eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+
+
+async def _eager_gather(coroutines: List[Any]) -> List[Any]:
+    """Gather coroutines with return_exceptions=True, starting them eagerly when supported."""
+    if _eager_task_factory is not None:
+        loop = asyncio.get_running_loop()
+        coroutines = [_eager_task_factory(loop, coroutine) for coroutine in coroutines]
+    return await asyncio.gather(*coroutines, return_exceptions=True)
+
+
+def _succeeded(task: "asyncio.Future[Any]") -> bool:
+    """Check whether a finished task returned normally."""
+    return not task.cancelled() and task.exception() is None
+
+
+class QuorumCancelledError(WorkflowExecutionError):
+    """Result placeholder for an agent task cancelled once its quorum was reached."""
+    error_code = "quorum_cancelled"
+    error_message = "Cancelled after quorum was reached"
+
+
+def _consensus_key(result: Any) -> str:
+    """Canonical form of an agent result, used to compare consensus votes."""
+    return json.dumps(result, sort_keys=True, default=str)
+
+
+async def _gather_quorum(
+    coroutines: List[Any],
+    quorum: int,
+    vote: Optional[Callable[[Any], Any]] = None
+) -> List[Any]:
+    """
+    Run coroutines concurrently until ``quorum`` of them succeed, then cancel the rest.
+
+    With ``vote``, successful results are grouped by ``vote(result)`` and the run
+    stops once ``quorum`` of them agree. The quorum is clamped to at least one.
+
+    Returns one entry per coroutine, in order: its result, its exception, or a
+    QuorumCancelledError for tasks cancelled once the quorum was reached.
+    """
+    if _eager_task_factory is not None:
+        loop = asyncio.get_running_loop()
+        tasks = [_eager_task_factory(loop, coroutine) for coroutine in coroutines]
+    else:
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+
+    quorum = max(quorum, 1)
+    votes: Counter = Counter()
+
+    def tally(finished: Any) -> None:
+        for task in finished:
+            if _succeeded(task):
+                votes[vote(task.result()) if vote else None] += 1
+
+    pending = {task for task in tasks if not task.done()}
+    tally(task for task in tasks if task.done())
+    try:
+        while pending and max(votes.values(), default=0) < quorum:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            tally(done)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    results = []
+    for task in tasks:
+        if task.cancelled():
+            results.append(QuorumCancelledError("Cancelled after quorum was reached"))
+        elif task.exception() is not None:
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results
+
+
+# Marks the end of a hierarchical leader's worker result stream; workers may return None
+_END_OF_RESULTS = object()
+
+
+def _datetime_from_ns(timestamp_ns: Optional[int]) -> Optional[datetime]:
+    """Convert a wall-clock nanosecond timestamp to a naive UTC datetime."""
+    if timestamp_ns is None:
+        return None
+    return datetime.utcfromtimestamp(timestamp_ns / 1e9)
 
 
 class AgentTask:
     """Represents a task assigned to an agent."""
 
+    __slots__ = (
+        "task_id",
+        "agent_id",
+        "step_id",
+        "task_type",
+        "input_data",
+        "config",
+        "priority",
+        "timeout_seconds",
+        "retry_config",
+        "_max_attempts",
+        "state",
+        "_assigned_ns",
+        "_started_ns",
+        "_completed_ns",
+        "_started_monotonic_ns",
+        "_completed_monotonic_ns",
+        "result",
+        "error",
+        "attempts",
+        "execution_context"
+    )
+
     def __init__(
         self,
         task_id: str,
         agent_id: str,
         step_id: int,
         task_type: str,
-        input_data: Dict[str, Any],
+        input_data: Mapping[str, Any],
         config: Dict[str, Any],
         priority: TaskPriority = TaskPriority.NORMAL,
         timeout_seconds: Optional[int] = None,
@@ -104,12 +223,16 @@ class AgentTask:
         self.priority = priority
         self.timeout_seconds = timeout_seconds or 300
         self.retry_config = retry_config or {"max_attempts": 3, "backoff_factor": 2}
+        self._max_attempts = self.retry_config.get("max_attempts", 3)
 
         # Execution tracking
         self.state = AgentState.ASSIGNED
-        self.assigned_at = datetime.utcnow()
-        self.started_at: Optional[datetime] = None
-        self.completed_at: Optional[datetime] = None
+        # Timestamps are kept as integer nanoseconds and materialized on access
+        self._assigned_ns = time.time_ns()
+        self._started_ns: Optional[int] = None
+        self._completed_ns: Optional[int] = None
+        self._started_monotonic_ns: Optional[int] = None
+        self._completed_monotonic_ns: Optional[int] = None
         self.result: Optional[Any] = None
         self.error: Optional[str] = None
         self.attempts = 0
@@ -118,30 +241,56 @@ class AgentTask:
     def start_execution(self) -> None:
         """Mark task as started."""
         self.state = AgentState.EXECUTING
-        self.started_at = datetime.utcnow()
+        self._started_ns = time.time_ns()
+        self._started_monotonic_ns = time.monotonic_ns()
+        self._completed_ns = None
+        self._completed_monotonic_ns = None
         self.attempts += 1
 
     def complete_execution(self, result: Any) -> None:
         """Mark task as completed."""
         self.state = AgentState.COMPLETED
-        self.completed_at = datetime.utcnow()
+        self._completed_ns = time.time_ns()
+        self._completed_monotonic_ns = time.monotonic_ns()
         self.result = result
 
     def fail_execution(self, error: str) -> None:
         """Mark task as failed."""
         self.state = AgentState.FAILED
-        self.completed_at = datetime.utcnow()
+        self._completed_ns = time.time_ns()
+        self._completed_monotonic_ns = time.monotonic_ns()
         self.error = error
 
+    def cancel_execution(self) -> None:
+        """Mark task as cancelled before it finished."""
+        self.state = AgentState.CANCELLED
+        self._completed_ns = time.time_ns()
+        self._completed_monotonic_ns = time.monotonic_ns()
+
     def can_retry(self) -> bool:
         """Check if task can be retried."""
-        max_attempts = self.retry_config.get("max_attempts", 3)
-        return self.attempts < max_attempts and self.state == AgentState.FAILED
+        return self.state == AgentState.FAILED and self.attempts < self._max_attempts
+
+    @property
+    def assigned_at(self) -> datetime:
+        """Time the task was assigned."""
+        return _datetime_from_ns(self._assigned_ns)
+
+    @property
+    def started_at(self) -> Optional[datetime]:
+        """Time the latest attempt started."""
+        return _datetime_from_ns(self._started_ns)
+
+    @property
+    def completed_at(self) -> Optional[datetime]:
+        """Time the latest attempt completed or failed."""
+        return _datetime_from_ns(self._completed_ns)
 
     def get_execution_time(self) -> Optional[timedelta]:
         """Get task execution time."""
-        if self.started_at and self.completed_at:
-            return self.completed_at - self.started_at
+        if self._started_monotonic_ns is not None and self._completed_monotonic_ns is not None:
+            elapsed_ns = self._completed_monotonic_ns - self._started_monotonic_ns
+            return timedelta(microseconds=elapsed_ns // 1000)
         return None
 
     def to_dict(self) -> Dict[str, Any]:
@@ -151,8 +300,8 @@ class AgentTask:
             "agent_id": self.agent_id,
             "step_id": self.step_id,
             "task_type": self.task_type,
-            "state": self.state.value,
-            "priority": self.priority.value,
+            "state": AgentState(self.state).name.lower(),
+            "priority": TaskPriority(self.priority).name.lower(),
             "attempts": self.attempts,
             "assigned_at": self.assigned_at.isoformat(),
             "started_at": self.started_at.isoformat() if self.started_at else None,
@@ -167,6 +316,25 @@ class AgentTask:
 class AgentCoordinationGroup:
     """Manages a group of agents working together."""
 
+    __slots__ = (
+        "group_id",
+        "strategy",
+        "agents",
+        "config",
+        "active_tasks",
+        "completed_tasks",
+        "failed_tasks",
+        "cancelled_tasks",
+        "completed_count",
+        "failed_count",
+        "cancelled_count",
+        "shared_context",
+        "message_queue",
+        "is_active",
+        "_created_ns",
+        "leader_agent"
+    )
+
     def __init__(
         self,
         group_id: str,
@@ -180,22 +348,32 @@ class AgentCoordinationGroup:
         self.agents = agents
         self.config = config
 
-        # Group state
+        # Group state; finished-task history is bounded, the counters are not
+        history_limit = config.get("history_limit", 1024)
         self.active_tasks: Dict[str, AgentTask] = {}
-        self.completed_tasks: List[AgentTask] = []
-        self.failed_tasks: List[AgentTask] = []
+        self.completed_tasks: Deque[AgentTask] = deque(maxlen=history_limit)
+        self.failed_tasks: Deque[AgentTask] = deque(maxlen=history_limit)
+        self.cancelled_tasks: Deque[AgentTask] = deque(maxlen=history_limit)
+        self.completed_count = 0
+        self.failed_count = 0
+        self.cancelled_count = 0
         self.shared_context: Dict[str, Any] = {}
         self.message_queue: deque = deque()
 
         # Coordination state
         self.is_active = True
-        self.created_at = datetime.utcnow()
+        self._created_ns = time.time_ns()
         self.leader_agent: Optional[str] = None
 
         # Set leader for hierarchical coordination
         if strategy == CoordinationStrategy.HIERARCHICAL and agents:
             self.leader_agent = agents[0]
 
+    @property
+    def created_at(self) -> datetime:
+        """Time the group was created."""
+        return _datetime_from_ns(self._created_ns)
+
     def add_task(self, task: AgentTask) -> None:
         """Add task to the group."""
         self.active_tasks[task.task_id] = task
@@ -206,6 +384,7 @@ class AgentCoordinationGroup:
             task = self.active_tasks.pop(task_id)
             task.complete_execution(result)
             self.completed_tasks.append(task)
+            self.completed_count += 1
 
     def fail_task(self, task_id: str, error: str) -> None:
         """Mark task as failed."""
@@ -213,11 +392,31 @@ class AgentCoordinationGroup:
             task = self.active_tasks.pop(task_id)
             task.fail_execution(error)
             self.failed_tasks.append(task)
+            self.failed_count += 1
+
+    def cancel_task(self, task_id: str) -> None:
+        """Mark task as cancelled."""
+        if task_id in self.active_tasks:
+            task = self.active_tasks.pop(task_id)
+            task.cancel_execution()
+            self.cancelled_tasks.append(task)
+            self.cancelled_count += 1
+
+    def finish_task(self, task_id: str, result: Any) -> None:
+        """Record a gathered result as completed, failed or cancelled."""
+        if isinstance(result, QuorumCancelledError):
+            self.cancel_task(task_id)
+        elif isinstance(result, Exception):
+            self.fail_task(task_id, str(result))
+        else:
+            self.complete_task(task_id, result)
 
     def get_progress(self) -> Dict[str, Any]:
         """Get group progress metrics."""
-        total_tasks = len(self.active_tasks) + len(self.completed_tasks) + len(self.failed_tasks)
-        completed_count = len(self.completed_tasks)
+        total_tasks = (
+            len(self.active_tasks) + self.completed_count + self.failed_count + self.cancelled_count
+        )
+        completed_count = self.completed_count
 
         return {
             "group_id": self.group_id,
@@ -225,13 +424,93 @@ class AgentCoordinationGroup:
             "total_tasks": total_tasks,
             "active_tasks": len(self.active_tasks),
             "completed_tasks": completed_count,
-            "failed_tasks": len(self.failed_tasks),
+            "failed_tasks": self.failed_count,
+            "cancelled_tasks": self.cancelled_count,
             "progress_percentage": (completed_count / total_tasks * 100) if total_tasks > 0 else 0,
             "is_active": self.is_active,
             "leader_agent": self.leader_agent
         }
 
 
+class AgentMetricsTable:
+    """
+    Per-agent execution metrics stored column-wise.
+
+    Each agent gets an integer slot into parallel typed arrays, so recording a
+    result is a few in-place writes and coordinator-wide totals are kept as
+    running sums instead of being recomputed across agents.
+    """
+
+    def __init__(self):
+        """Initialize an empty metrics table."""
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all agents and totals."""
+        self._slots: Dict[str, int] = {}
+        self._total_tasks = array("q")
+        self._successful_tasks = array("q")
+        self._total_execution_time = array("d")
+        self._last_updated_ns = array("q")
+        self.tasks_recorded = 0
+        self.successful_recorded = 0
+
+    def record(self, agent_id: str, execution_time: float, success: bool) -> None:
+        """Record one task result for an agent."""
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            slot = self._slots[agent_id] = len(self._slots)
+            self._total_tasks.append(0)
+            self._successful_tasks.append(0)
+            self._total_execution_time.append(0.0)
+            self._last_updated_ns.append(0)
+
+        self._total_tasks[slot] += 1
+        self._total_execution_time[slot] += execution_time
+        self._last_updated_ns[slot] = time.time_ns()
+        self.tasks_recorded += 1
+
+        if success:
+            self._successful_tasks[slot] += 1
+            self.successful_recorded += 1
+
+    def success_rate(self, agent_id: str, default: float = 0.0) -> float:
+        """Get an agent's success rate, or ``default`` if it has no results."""
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            return default
+        return self._successful_tasks[slot] / self._total_tasks[slot]
+
+    def get(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """Materialize one agent's metrics as a dictionary."""
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            return None
+
+        total_tasks = self._total_tasks[slot]
+        total_execution_time = self._total_execution_time[slot]
+        return {
+            "total_tasks": total_tasks,
+            "successful_tasks": self._successful_tasks[slot],
+            "total_execution_time": total_execution_time,
+            "average_execution_time": total_execution_time / total_tasks,
+            "success_rate": self._successful_tasks[slot] / total_tasks,
+            "last_updated": _datetime_from_ns(self._last_updated_ns[slot])
+        }
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Materialize metrics for every agent."""
+        return {agent_id: self.get(agent_id) for agent_id in self._slots}
+
+    def __contains__(self, agent_id: str) -> bool:
+        """Check whether an agent has recorded results."""
+        return agent_id in self._slots
+
+    def __len__(self) -> int:
+        """Number of agents with recorded results."""
+        return len(self._slots)
+
+
 class MultiAgentCoordinator:
     """
     Core multi-agent coordination engine for workflow execution.
@@ -240,6 +519,16 @@ class MultiAgentCoordinator:
     sophisticated coordination strategies, load balancing, and error handling.
     """
 
+    # Coordination method for each supported strategy
+    _STRATEGY_DISPATCH: Dict[CoordinationStrategy, str] = {
+        CoordinationStrategy.PARALLEL: "_execute_parallel_coordination",
+        CoordinationStrategy.SEQUENTIAL: "_execute_sequential_coordination",
+        CoordinationStrategy.PIPELINE: "_execute_pipeline_coordination",
+        CoordinationStrategy.SCATTER_GATHER: "_execute_scatter_gather_coordination",
+        CoordinationStrategy.CONSENSUS: "_execute_consensus_coordination",
+        CoordinationStrategy.HIERARCHICAL: "_execute_hierarchical_coordination",
+    }
+
     def __init__(
         self,
         db_session: AsyncSession,
@@ -259,21 +548,28 @@ class MultiAgentCoordinator:
         self.pool_discovery = AgentPoolDiscovery(db_session)
         self.capability_matcher = CapabilityMatcher(db_session)
 
+        # Discovery results keyed by requirements, busy agents included; entries expire
+        # after one heartbeat. Busy agents are filtered out per lookup using the running
+        # task count per agent.
+        self._discovery_cache: Dict[Tuple, Tuple[List[Agent], float]] = {}
+        self._discovery_cache_size = 256
+        self._running_by_agent: Counter = Counter()
+
         # Coordination state
         self.active_agents: Dict[str, Agent] = {}
         self.agent_tasks: Dict[str, List[AgentTask]] = defaultdict(list)
         self.coordination_groups: Dict[str, AgentCoordinationGroup] = {}
-        self.task_queue: deque = deque()
+
+        # Task dispatch; the queue and worker slots are created by start() on the running loop
+        self.task_queue: Optional[asyncio.PriorityQueue] = None
+        self._task_sequence = itertools.count()
+        self._dispatch_slots: Optional[asyncio.Semaphore] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._dispatched: Set[asyncio.Task] = set()
 
         # Performance tracking
-        self.agent_metrics: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.coordination_stats: Dict[str, Any] = {
-            "total_tasks_executed": 0,
-            "total_agents_used": 0,
-            "average_task_duration": 0.0,
-            "success_rate": 0.0,
-            "load_balancing_events": 0
-        }
+        self.agent_metrics = AgentMetricsTable()
+        self.coordination_stats: Dict[str, Any] = self._initial_coordination_stats()
 
         # Event handlers
         self.event_handlers: Dict[str, List[Callable]] = defaultdict(list)
@@ -289,11 +585,18 @@ class MultiAgentCoordinator:
         )
 
     async def start(self) -> None:
-        """Start the coordinator and monitoring systems."""
+        """Start the coordinator and monitoring systems; a shut-down coordinator can be restarted."""
+        self._shutdown_requested = False
+
         if not self._monitoring_task:
             self._monitoring_task = asyncio.create_task(self._monitoring_loop())
             logfire.info("Multi-agent coordinator started")
 
+        if not self._dispatch_task:
+            self.task_queue = asyncio.PriorityQueue(maxsize=self.max_concurrent_agents * 4)
+            self._dispatch_slots = asyncio.Semaphore(self.max_concurrent_agents)
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+
     async def shutdown(self) -> None:
         """Shutdown the coordinator gracefully."""
         self._shutdown_requested = True
@@ -304,15 +607,165 @@ class MultiAgentCoordinator:
                 if task.state == AgentState.EXECUTING:
                     task.fail_execution("Coordinator shutdown")
 
-        # Stop monitoring
-        if self._monitoring_task:
-            self._monitoring_task.cancel()
+        # Stop monitoring and dispatch
+        for background_task in (self._monitoring_task, self._dispatch_task):
+            if background_task:
+                background_task.cancel()
+                try:
+                    await background_task
+                except asyncio.CancelledError:
+                    pass
+
+        # Release callers still waiting on queued or running submissions
+        self._drain_task_queue()
+        dispatched = list(self._dispatched)
+        for task in dispatched:
+            task.cancel()
+        if dispatched:
+            await asyncio.gather(*dispatched, return_exceptions=True)
+
+        # Back to the never-started state: tasks run directly until start() is called again
+        self._monitoring_task = None
+        self._dispatch_task = None
+        self.task_queue = None
+        self._dispatch_slots = None
+
+        logfire.info("Multi-agent coordinator shutdown complete")
+
+    def reset_state(self) -> None:
+        """Clear per-run coordination state, keeping components and background tasks."""
+        self.active_agents.clear()
+        self.agent_tasks.clear()
+        self.coordination_groups.clear()
+        self.agent_metrics.clear()
+        self.invalidate_discovery_cache()
+        self._running_by_agent.clear()
+        self._drain_task_queue()
+        self.coordination_stats = self._initial_coordination_stats()
+
+    def _drain_task_queue(self) -> None:
+        """Drop queued submissions; their callers see a cancelled future."""
+        if self.task_queue is None:
+            return
+        while not self.task_queue.empty():
+            *_, future = self.task_queue.get_nowait()
+            future.cancel()
+            self.task_queue.task_done()
+
+    @staticmethod
+    def _initial_coordination_stats() -> Dict[str, Any]:
+        """Build the zeroed coordination statistics."""
+        return {
+            "total_tasks_executed": 0,
+            "total_agents_used": 0,
+            "average_task_duration": 0.0,
+            "success_rate": 0.0,
+            "load_balancing_events": 0
+        }
+
+    async def submit_task(
+        self,
+        agent: Agent,
+        task: AgentTask,
+        context: ExecutionContext
+    ) -> "asyncio.Future[Any]":
+        """
+        Queue an agent task for the dispatch loop.
+
+        Tasks are dispatched by priority, then assignment time, then submission
+        order. Waits while the queue is full, so producers are throttled to the
+        coordinator's capacity.
+
+        Returns:
+            Future resolved with the task result or exception
+        """
+        if self.task_queue is None:
+            raise WorkflowExecutionError("Multi-agent coordinator is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        await self.task_queue.put((
+            int(task.priority),
+            task._assigned_ns,
+            next(self._task_sequence),
+            agent,
+            task,
+            context,
+            future
+        ))
+        return future
+
+    async def _run_agent_task(
+        self,
+        agent: Agent,
+        task: AgentTask,
+        context: ExecutionContext
+    ) -> Any:
+        """
+        Run an agent task through the dispatch queue and wait for its result.
+
+        Coordinators that were never started run the task directly.
+        """
+        if self._dispatch_task is None:
+            return await self._execute_agent_task(agent, task, context)
+
+        future = await self.submit_task(agent, task, context)
+        return await future
+
+    async def _dispatch_loop(self) -> None:
+        """Run queued agent tasks, at most max_concurrent_agents at a time."""
+        while not self._shutdown_requested:
             try:
-                await self._monitoring_task
+                *_, agent, task, context, future = await self.task_queue.get()
             except asyncio.CancelledError:
-                pass
+                break
 
-        logfire.info("Multi-agent coordinator shutdown complete")
+            # The submitter gave up while the task was queued
+            if future.cancelled():
+                self.task_queue.task_done()
+                continue
+
+            try:
+                await self._dispatch_slots.acquire()
+            except asyncio.CancelledError:
+                future.cancel()
+                self.task_queue.task_done()
+                break
+
+            dispatched = asyncio.create_task(
+                self._run_dispatched_task(agent, task, context, future)
+            )
+            self._dispatched.add(dispatched)
+            dispatched.add_done_callback(functools.partial(self._finish_dispatched, future))
+
+            # A submitter that stops waiting (e.g. a quorum was reached) stops the agent too
+            future.add_done_callback(
+                lambda done, dispatched=dispatched: dispatched.cancel() if done.cancelled() else None
+            )
+
+    async def _run_dispatched_task(
+        self,
+        agent: Agent,
+        task: AgentTask,
+        context: ExecutionContext,
+        future: "asyncio.Future[Any]"
+    ) -> None:
+        """Execute one dispatched task and resolve its submission future."""
+        try:
+            result = await self._execute_agent_task(agent, task, context)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+    def _finish_dispatched(self, future: "asyncio.Future[Any]", dispatched: asyncio.Task) -> None:
+        """Release a finished dispatch's worker slot; cancelled runs cancel their future."""
+        self._dispatched.discard(dispatched)
+        self._dispatch_slots.release()
+        self.task_queue.task_done()
+        if dispatched.cancelled() and not future.done():
+            future.cancel()
 
     async def execute_multi_agent_step(
         self,
@@ -362,33 +815,14 @@ class MultiAgentCoordinator:
 
             try:
                 # Execute based on strategy
-                if strategy == CoordinationStrategy.PARALLEL:
-                    result = await self._execute_parallel_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                elif strategy == CoordinationStrategy.SEQUENTIAL:
-                    result = await self._execute_sequential_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                elif strategy == CoordinationStrategy.PIPELINE:
-                    result = await self._execute_pipeline_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                elif strategy == CoordinationStrategy.SCATTER_GATHER:
-                    result = await self._execute_scatter_gather_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                elif strategy == CoordinationStrategy.CONSENSUS:
-                    result = await self._execute_consensus_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                elif strategy == CoordinationStrategy.HIERARCHICAL:
-                    result = await self._execute_hierarchical_coordination(
-                        coordination_group, step, context, agents, timeout_seconds
-                    )
-                else:
+                method_name = self._STRATEGY_DISPATCH.get(strategy)
+                if method_name is None:
                     raise WorkflowValidationError(f"Unsupported coordination strategy: {strategy.value}")
 
+                result = await getattr(self, method_name)(
+                    coordination_group, step, context, agents, timeout_seconds, step_config
+                )
+
                 # Emit success event
                 await self._emit_event("step_completed", {
                     "step_id": step.id,
@@ -411,6 +845,9 @@ class MultiAgentCoordinator:
                 raise
 
             finally:
+                # Summarize the group's tasks, whether the step succeeded or not
+                self._log_group_tasks(coordination_group)
+
                 # Cleanup coordination group
                 if group_id in self.coordination_groups:
                     del self.coordination_groups[group_id]
@@ -429,10 +866,9 @@ class MultiAgentCoordinator:
             max_count = requirements.get("max_count", 5)
 
             # Discover available agents
-            available_agents = await self.pool_discovery.discover_agents(
-                capabilities=required_capabilities,
-                min_performance_score=requirements.get("min_performance_score", 0.7),
-                exclude_busy=True
+            available_agents = await self._discover_agents(
+                required_capabilities,
+                requirements.get("min_performance_score", 0.7)
             )
 
             if not available_agents:
@@ -461,16 +897,65 @@ class MultiAgentCoordinator:
 
             return selected_agents
 
+    def invalidate_discovery_cache(self, agent_id: Optional[str] = None) -> None:
+        """
+        Drop cached agent discovery results, e.g. after an agent's status changed.
+
+        With ``agent_id``, only the results listing that agent are dropped.
+        """
+        if agent_id is None:
+            self._discovery_cache.clear()
+            return
+
+        for cache_key, (agents, _) in list(self._discovery_cache.items()):
+            if any(agent.id == agent_id for agent in agents):
+                del self._discovery_cache[cache_key]
+
+    async def _discover_agents(
+        self,
+        capabilities: List[str],
+        min_performance_score: float
+    ) -> List[Agent]:
+        """Discover available agents, reusing results for identical requirements."""
+        now = time.monotonic()
+        cache_key = (tuple(sorted(capabilities)), min_performance_score)
+
+        cached = self._discovery_cache.get(cache_key)
+        if cached is not None and now - cached[1] < self.heartbeat_interval:
+            agents = cached[0]
+        else:
+            agents = await self.pool_discovery.discover_agents(
+                capabilities=capabilities,
+                min_performance_score=min_performance_score,
+                exclude_busy=False
+            )
+
+            # Evict the oldest entry once the cache is full
+            self._discovery_cache.pop(cache_key, None)
+            if len(self._discovery_cache) >= self._discovery_cache_size:
+                self._discovery_cache.pop(next(iter(self._discovery_cache)))
+            self._discovery_cache[cache_key] = (agents, now)
+
+        # Availability changes too often to cache; filter busy agents per lookup
+        return [
+            agent for agent in agents
+            if agent.status != AgentStatus.BUSY and agent.id not in self._running_by_agent
+        ]
+
     async def _execute_parallel_coordination(
         self,
         group: AgentCoordinationGroup,
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute agents in parallel."""
         with logfire.span("Parallel coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             # Create tasks for each agent
             tasks = []
             for i, agent in enumerate(agents):
@@ -479,19 +964,19 @@ class MultiAgentCoordinator:
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
-                    input_data=context.variables,
-                    config=step.configuration or {},
+                    step_id=step_id,
+                    task_type=task_type,
+                    input_data=context.variables_view,
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
-                task_coroutine = self._execute_agent_task(agent, agent_task, context)
+                task_coroutine = self._run_agent_task(agent, agent_task, context)
                 tasks.append(task_coroutine)
 
             # Execute all tasks in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await _eager_gather(tasks)
 
             # Process results
             successful_results = []
@@ -522,10 +1007,14 @@ class MultiAgentCoordinator:
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute agents sequentially."""
         with logfire.span("Sequential coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             results = []
 
             for i, agent in enumerate(agents):
@@ -534,17 +1023,17 @@ class MultiAgentCoordinator:
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
-                    input_data=context.variables,
-                    config=step.configuration or {},
+                    step_id=step_id,
+                    task_type=task_type,
+                    input_data=context.variables_view,
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
 
                 try:
-                    result = await self._execute_agent_task(agent, agent_task, context)
+                    result = await self._run_agent_task(agent, agent_task, context)
                     results.append(result)
                     group.complete_task(task_id, result)
 
@@ -567,11 +1056,16 @@ class MultiAgentCoordinator:
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute agents in pipeline mode."""
         with logfire.span("Pipeline coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             current_data = context.variables
+            stage_input = context.variables_view
 
             for i, agent in enumerate(agents):
                 task_id = f"{group.group_id}_task_{i}"
@@ -579,24 +1073,24 @@ class MultiAgentCoordinator:
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
-                    input_data=current_data,
-                    config=step.configuration or {},
+                    step_id=step_id,
+                    task_type=task_type,
+                    input_data=stage_input,
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
 
                 try:
-                    result = await self._execute_agent_task(agent, agent_task, context)
+                    result = await self._run_agent_task(agent, agent_task, context)
                     group.complete_task(task_id, result)
 
                     # Pass result as input to next agent
                     if isinstance(result, dict):
-                        current_data.update(result)
+                        context.update_variables(result)
                     else:
-                        current_data[f"stage_{i}_output"] = result
+                        context.set_variable(f"stage_{i}_output", result)
 
                 except Exception as e:
                     group.fail_task(task_id, str(e))
@@ -610,10 +1104,14 @@ class MultiAgentCoordinator:
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute scatter-gather pattern."""
         with logfire.span("Scatter-gather coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             # Scatter: Divide input data among agents
             input_data = context.variables
             data_chunks = self._scatter_data(input_data, len(agents))
@@ -626,29 +1124,26 @@ class MultiAgentCoordinator:
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
+                    step_id=step_id,
+                    task_type=task_type,
                     input_data=chunk,
-                    config=step.configuration or {},
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
-                task_coroutine = self._execute_agent_task(agent, agent_task, context)
+                task_coroutine = self._run_agent_task(agent, agent_task, context)
                 tasks.append(task_coroutine)
 
-            # Gather: Collect and combine results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Gather: Collect and combine results, leaving up to straggler_tolerance behind
+            straggler_tolerance = step_config.get("straggler_tolerance", 0)
+            results = await _gather_quorum(tasks, len(agents) - straggler_tolerance)
 
             gathered_result = self._gather_results(results)
 
-            # Mark tasks as completed
+            # Mark tasks as completed; stragglers left behind are cancelled, not failed
             for i, result in enumerate(results):
-                task_id = f"{group.group_id}_task_{i}"
-                if isinstance(result, Exception):
-                    group.fail_task(task_id, str(result))
-                else:
-                    group.complete_task(task_id, result)
+                group.finish_task(f"{group.group_id}_task_{i}", result)
 
             return gathered_result
 
@@ -658,10 +1153,14 @@ class MultiAgentCoordinator:
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute consensus-based coordination."""
         with logfire.span("Consensus coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             # Execute all agents in parallel
             tasks = []
             for i, agent in enumerate(agents):
@@ -670,37 +1169,42 @@ class MultiAgentCoordinator:
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
-                    input_data=context.variables,
-                    config=step.configuration or {},
+                    step_id=step_id,
+                    task_type=task_type,
+                    input_data=context.variables_view,
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
-                task_coroutine = self._execute_agent_task(agent, agent_task, context)
+                task_coroutine = self._run_agent_task(agent, agent_task, context)
                 tasks.append(task_coroutine)
 
-            # Get all results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Stop waiting once one answer has a majority of all agents (or the
+            # configured number of agreeing votes); outstanding votes can't change it
+            quorum = min(step_config.get("consensus_quorum", len(agents) // 2 + 1), len(agents))
+            results = await _gather_quorum(tasks, quorum, vote=_consensus_key)
 
             # Filter successful results
             successful_results = []
             for i, result in enumerate(results):
-                task_id = f"{group.group_id}_task_{i}"
-                if isinstance(result, Exception):
-                    group.fail_task(task_id, str(result))
-                else:
+                group.finish_task(f"{group.group_id}_task_{i}", result)
+                if not isinstance(result, Exception):
                     successful_results.append(result)
-                    group.complete_task(task_id, result)
 
             # Apply consensus algorithm
             consensus_result = self._apply_consensus(successful_results)
 
+            # Confidence is the share of collected answers that agree with the consensus
+            confidence = 0.0
+            if successful_results:
+                votes = Counter(_consensus_key(result) for result in successful_results)
+                confidence = max(votes.values()) / len(successful_results)
+
             return {
                 "consensus_result": consensus_result,
                 "individual_results": successful_results,
-                "consensus_confidence": len(successful_results) / len(agents)
+                "consensus_confidence": confidence
             }
 
     async def _execute_hierarchical_coordination(
@@ -709,68 +1213,123 @@ class MultiAgentCoordinator:
         step: WorkflowStep,
         context: ExecutionContext,
         agents: List[Agent],
-        timeout_seconds: int
+        timeout_seconds: int,
+        step_config: Dict[str, Any]
     ) -> Any:
         """Execute hierarchical coordination with leader."""
         with logfire.span("Hierarchical coordination", group_id=group.group_id):
+            step_id = step.id
+            task_type = step.step_type.value
+
             leader_agent = agents[0]
             worker_agents = agents[1:]
 
-            # Execute workers first
-            worker_results = []
+            # Execute workers first, concurrently; they are independent of each other
+            tasks = []
             for i, agent in enumerate(worker_agents):
                 task_id = f"{group.group_id}_worker_{i}"
 
                 agent_task = AgentTask(
                     task_id=task_id,
                     agent_id=agent.id,
-                    step_id=step.id,
-                    task_type=step.step_type.value,
-                    input_data=context.variables,
-                    config=step.configuration or {},
+                    step_id=step_id,
+                    task_type=task_type,
+                    input_data=context.variables_view,
+                    config=step_config,
                     timeout_seconds=timeout_seconds
                 )
 
                 group.add_task(agent_task)
+                task_coroutine = self._run_agent_task(agent, agent_task, context)
+                tasks.append(task_coroutine)
 
-                try:
-                    result = await self._execute_agent_task(agent, agent_task, context)
-                    worker_results.append(result)
-                    group.complete_task(task_id, result)
-                except Exception as e:
-                    group.fail_task(task_id, str(e))
-                    logfire.warning(f"Worker agent {i} failed: {str(e)}")
-
-            # Leader consolidates worker results
+            # Leader consolidates worker results. Leaders that accept a stream start
+            # alongside the workers and drain results from a queue until the
+            # worker_results_end marker arrives.
+            stream_results = step_config.get("stream_worker_results", False)
+            worker_results: List[Any] = []
             leader_task_id = f"{group.group_id}_leader"
-            leader_input = context.variables.copy()
-            leader_input["worker_results"] = worker_results
+
+            if stream_results:
+                result_queue: asyncio.Queue = asyncio.Queue()
+                leader_input = ChainMap(
+                    {
+                        "worker_results_stream": result_queue,
+                        "worker_results_end": _END_OF_RESULTS,
+                        "worker_count": len(worker_agents)
+                    },
+                    context.variables_view
+                )
+                tasks = [self._publish_result(result_queue, coroutine) for coroutine in tasks]
+            else:
+                # Filled in below, before the leader runs
+                leader_input = ChainMap({"worker_results": worker_results}, context.variables_view)
 
             leader_task = AgentTask(
                 task_id=leader_task_id,
                 agent_id=leader_agent.id,
-                step_id=step.id,
-                task_type=step.step_type.value,
+                step_id=step_id,
+                task_type=task_type,
                 input_data=leader_input,
-                config=step.configuration or {},
+                config=step_config,
                 timeout_seconds=timeout_seconds
             )
 
             group.add_task(leader_task)
 
+            leader_run = None
             try:
-                final_result = await self._execute_agent_task(leader_agent, leader_task, context)
-                group.complete_task(leader_task_id, final_result)
-
-                return {
-                    "final_result": final_result,
-                    "worker_results": worker_results,
-                    "leader_id": leader_agent.id,
-                    "worker_count": len(worker_agents)
-                }
-            except Exception as e:
-                group.fail_task(leader_task_id, str(e))
-                raise WorkflowExecutionError(f"Leader agent failed: {str(e)}")
+                if stream_results:
+                    # Run outside the dispatch queue: the leader holds no worker slot while
+                    # it waits on its workers
+                    leader_run = asyncio.ensure_future(
+                        self._execute_agent_task(leader_agent, leader_task, context)
+                    )
+
+                try:
+                    results = await _eager_gather(tasks)
+                finally:
+                    if stream_results:
+                        result_queue.put_nowait(_END_OF_RESULTS)
+
+                for i, result in enumerate(results):
+                    task_id = f"{group.group_id}_worker_{i}"
+                    if isinstance(result, Exception):
+                        group.fail_task(task_id, str(result))
+                        logfire.warning(f"Worker agent {i} failed: {str(result)}")
+                    else:
+                        worker_results.append(result)
+                        group.complete_task(task_id, result)
+
+                try:
+                    if leader_run is not None:
+                        final_result = await leader_run
+                    else:
+                        final_result = await self._run_agent_task(leader_agent, leader_task, context)
+                    group.complete_task(leader_task_id, final_result)
+
+                    return {
+                        "final_result": final_result,
+                        "worker_results": worker_results,
+                        "leader_id": leader_agent.id,
+                        "worker_count": len(worker_agents)
+                    }
+                except Exception as e:
+                    group.fail_task(leader_task_id, str(e))
+                    raise WorkflowExecutionError(f"Leader agent failed: {str(e)}")
+
+            finally:
+                # A cancelled or failed coordination must not leave the streaming leader running
+                if leader_run is not None:
+                    leader_run.cancel()
+                    await asyncio.gather(leader_run, return_exceptions=True)
+
+    @staticmethod
+    async def _publish_result(result_queue: asyncio.Queue, coroutine: Any) -> Any:
+        """Await a worker coroutine and publish its successful result to the leader's queue."""
+        result = await coroutine
+        result_queue.put_nowait(result)
+        return result
 
     async def _execute_agent_task(
         self,
@@ -778,80 +1337,87 @@ class MultiAgentCoordinator:
         task: AgentTask,
         context: ExecutionContext
     ) -> Any:
-        """Execute a single agent task."""
-        with logfire.span(
-            "Agent task execution",
-            agent_id=agent.id,
-            task_id=task.task_id,
-            step_id=task.step_id
-        ):
-            task.start_execution()
-
-            try:
-                # Get agent instance from registry
-                agent_instance = await self.agent_registry.get_agent(agent.id)
-                if not agent_instance:
-                    raise AgentError(f"Agent {agent.id} not found in registry")
-
-                # Execute the task
-                result = await agent_instance.execute_task(
-                    task_type=task.task_type,
-                    input_data=task.input_data,
-                    config=task.config,
-                    timeout_seconds=task.timeout_seconds
-                )
-
-                # Update metrics
-                execution_time = task.get_execution_time()
-                if execution_time:
-                    self._update_agent_metrics(agent.id, execution_time.total_seconds(), True)
-
-                task.complete_execution(result)
-
-                logfire.info(
-                    "Agent task completed",
-                    agent_id=agent.id,
-                    task_id=task.task_id,
-                    execution_time=execution_time.total_seconds() if execution_time else None
-                )
+        """Execute a single agent task; coordination methods log a per-group summary."""
+        task.start_execution()
+
+        # Busy while the task runs; discovery lookups skip the agent until it ends
+        self._running_by_agent[agent.id] += 1
+        try:
+            # Get agent instance from registry
+            agent_instance = await self.agent_registry.get_agent(agent.id)
+            if not agent_instance:
+                raise AgentError(f"Agent {agent.id} not found in registry")
+
+            # Execute the task
+            result = await agent_instance.execute_task(
+                task_type=task.task_type,
+                input_data=task.input_data,
+                config=task.config,
+                timeout_seconds=task.timeout_seconds
+            )
 
-                return result
+            # Update metrics once the end time is recorded
+            task.complete_execution(result)
+            execution_time = task.get_execution_time()
+            if execution_time is not None:
+                self._update_agent_metrics(agent.id, execution_time.total_seconds(), True)
+
+            return result
+
+        except Exception as e:
+            # Update metrics once the end time is recorded
+            task.fail_execution(str(e))
+            execution_time = task.get_execution_time()
+            if execution_time is not None:
+                self._update_agent_metrics(agent.id, execution_time.total_seconds(), False)
+
+            logfire.error(
+                "Agent task failed",
+                agent_id=agent.id,
+                task_id=task.task_id,
+                error=str(e)
+            )
 
-            except Exception as e:
-                # Update metrics
-                execution_time = task.get_execution_time()
-                if execution_time:
-                    self._update_agent_metrics(agent.id, execution_time.total_seconds(), False)
+            raise
 
-                task.fail_execution(str(e))
+        finally:
+            self._running_by_agent[agent.id] -= 1
+            if self._running_by_agent[agent.id] <= 0:
+                del self._running_by_agent[agent.id]
 
-                logfire.error(
-                    "Agent task failed",
-                    agent_id=agent.id,
-                    task_id=task.task_id,
-                    error=str(e)
-                )
+    def _log_group_tasks(self, group: AgentCoordinationGroup) -> None:
+        """Emit one log record summarizing the tasks of a coordination group, finished or not."""
+        trace = []
+        for task in itertools.chain(
+            group.completed_tasks, group.failed_tasks, group.cancelled_tasks, group.active_tasks.values()
+        ):
+            execution_time = task.get_execution_time()
+            trace.append({
+                "agent_id": task.agent_id,
+                "task_id": task.task_id,
+                "state": AgentState(task.state).name.lower(),
+                "execution_time": execution_time.total_seconds() if execution_time else None
+            })
 
-                raise
+        logfire.info("Agent tasks completed", group_id=group.group_id, trace=trace)
 
     def _scatter_data(self, data: Dict[str, Any], chunk_count: int) -> List[Dict[str, Any]]:
         """Scatter input data into chunks for parallel processing."""
         if chunk_count <= 1:
             return [data]
 
-        chunks = []
-        items = list(data.items())
-        chunk_size = max(1, len(items) // chunk_count)
-
-        for i in range(0, len(items), chunk_size):
-            chunk = dict(items[i:i + chunk_size])
-            chunks.append(chunk)
+        # Balanced split: the first (len % chunk_count) chunks get one extra item
+        items = tuple(data.items())
+        base_size, extra = divmod(len(items), chunk_count)
 
-        # Ensure we have exactly chunk_count chunks
-        while len(chunks) < chunk_count:
-            chunks.append({})
+        chunks = []
+        start = 0
+        for i in range(chunk_count):
+            end = start + base_size + (1 if i < extra else 0)
+            chunks.append(dict(items[start:end]))
+            start = end
 
-        return chunks[:chunk_count]
+        return chunks
 
     def _gather_results(self, results: List[Any]) -> Dict[str, Any]:
         """Gather and combine results from multiple agents."""
@@ -893,8 +1459,7 @@ class MultiAgentCoordinator:
         # Count occurrences of each result
         result_counts = defaultdict(int)
         for result in results:
-            result_str = json.dumps(result, sort_keys=True, default=str)
-            result_counts[result_str] += 1
+            result_counts[_consensus_key(result)] += 1
 
         # Return most common result
         if result_counts:
@@ -912,7 +1477,7 @@ class MultiAgentCoordinator:
         agent_loads = []
         for agent in agents:
             active_tasks = len(self.agent_tasks.get(agent.id, []))
-            performance_score = self.agent_metrics.get(agent.id, {}).get("success_rate", 1.0)
+            performance_score = self.agent_metrics.success_rate(agent.id, 1.0)
 
             # Calculate load score (lower is better)
             load_score = active_tasks / (performance_score + 0.1)
@@ -927,35 +1492,13 @@ class MultiAgentCoordinator:
 
     def _update_agent_metrics(self, agent_id: str, execution_time: float, success: bool) -> None:
         """Update performance metrics for an agent."""
-        if agent_id not in self.agent_metrics:
-            self.agent_metrics[agent_id] = {
-                "total_tasks": 0,
-                "successful_tasks": 0,
-                "total_execution_time": 0.0,
-                "average_execution_time": 0.0,
-                "success_rate": 0.0,
-                "last_updated": datetime.utcnow()
-            }
-
-        metrics = self.agent_metrics[agent_id]
-        metrics["total_tasks"] += 1
-        metrics["total_execution_time"] += execution_time
-
-        if success:
-            metrics["successful_tasks"] += 1
-
-        metrics["average_execution_time"] = metrics["total_execution_time"] / metrics["total_tasks"]
-        metrics["success_rate"] = metrics["successful_tasks"] / metrics["total_tasks"]
-        metrics["last_updated"] = datetime.utcnow()
+        self.agent_metrics.record(agent_id, execution_time, success)
 
         # Update global stats
         self.coordination_stats["total_tasks_executed"] += 1
         if success:
-            total_successful = sum(
-                m["successful_tasks"] for m in self.agent_metrics.values()
-            )
             self.coordination_stats["success_rate"] = (
-                total_successful / self.coordination_stats["total_tasks_executed"]
+                self.agent_metrics.successful_recorded / self.coordination_stats["total_tasks_executed"]
             )
 
     async def _monitoring_loop(self) -> None:
@@ -984,6 +1527,9 @@ class MultiAgentCoordinator:
                     if agent_id in self.active_agents:
                         del self.active_agents[agent_id]
 
+                    # Cached discovery results may still list the agent
+                    self.invalidate_discovery_cache(agent_id)
+
                     # Fail any active tasks for this agent
                     for task in self.agent_tasks.get(agent_id, []):
                         if task.state == AgentState.EXECUTING:
@@ -996,13 +1542,14 @@ class MultiAgentCoordinator:
 
     async def _cleanup_completed_tasks(self) -> None:
         """Clean up completed tasks from memory."""
-        cutoff_time = datetime.utcnow() - timedelta(hours=1)
+        # Compare raw nanosecond timestamps rather than building a datetime per task
+        cutoff_ns = time.time_ns() - 3600 * 10**9
 
         for agent_id, tasks in self.agent_tasks.items():
             self.agent_tasks[agent_id] = [
                 task for task in tasks
                 if task.state in [AgentState.ASSIGNED, AgentState.EXECUTING] or
-                (task.completed_at and task.completed_at > cutoff_time)
+                (task._completed_ns is not None and task._completed_ns > cutoff_ns)
             ]
 
     async def _emit_metrics(self) -> None:
@@ -1059,10 +1606,7 @@ class MultiAgentCoordinator:
             "active_agents_count": len(self.active_agents),
             "active_groups_count": len(self.coordination_groups),
             "total_agent_metrics": len(self.agent_metrics),
-            "agent_performance": {
-                agent_id: metrics.copy()
-                for agent_id, metrics in self.agent_metrics.items()
-            }
+            "agent_performance": self.agent_metrics.to_dict()
         }
 
     def get_active_coordination_groups(self) -> Dict[str, Dict[str, Any]]:
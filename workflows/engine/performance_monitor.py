@@ -14,26 +14,39 @@ Features:
 """
 
 import asyncio
+import sys
 import time
 import psutil
 import gc
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set, Union, Callable, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Set, Union, Callable, Tuple
 from enum import Enum
 from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
 import statistics
 import json
 import logging
+import operator
 
 import logfire
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# Optional dependencies
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from ...core.exceptions import WorkflowError, ValidationError
 from ...core.logging import log_operation
 from .execution_context import ExecutionContext
 
 
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class MetricType(Enum):
     """Types of performance metrics."""
     COUNTER = "counter"
@@ -61,7 +74,7 @@ class ResourceType(Enum):
     AGENT_POOL = "agent_pool"
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class PerformanceMetric:
     """Represents a performance metric."""
     name: str
@@ -157,9 +170,32 @@ class WorkflowPerformanceStats:
         }
 
 
+# Comparison operators supported by threshold rules
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "gt": operator.gt,
+    "lt": operator.lt,
+    "gte": operator.ge,
+    "lte": operator.le,
+    "eq": operator.eq
+}
+
+
 class ThresholdRule:
     """Performance threshold rule for alerting."""
 
+    __slots__ = (
+        "metric_name",
+        "threshold_value",
+        "comparison",
+        "_compare",
+        "severity",
+        "message_template",
+        "consecutive_violations",
+        "cooldown_minutes",
+        "current_violations",
+        "last_alert_time"
+    )
+
     def __init__(
         self,
         metric_name: str,
@@ -174,6 +210,7 @@ class ThresholdRule:
         self.metric_name = metric_name
         self.threshold_value = threshold_value
         self.comparison = comparison
+        self._compare = _COMPARISONS.get(comparison)
         self.severity = severity
         self.message_template = message_template
         self.consecutive_violations = consecutive_violations
@@ -185,20 +222,8 @@ class ThresholdRule:
 
     def evaluate(self, metric_value: Union[int, float]) -> bool:
         """Evaluate if metric violates threshold."""
-        violation = False
-
-        if self.comparison == "gt":
-            violation = metric_value > self.threshold_value
-        elif self.comparison == "lt":
-            violation = metric_value < self.threshold_value
-        elif self.comparison == "gte":
-            violation = metric_value >= self.threshold_value
-        elif self.comparison == "lte":
-            violation = metric_value <= self.threshold_value
-        elif self.comparison == "eq":
-            violation = metric_value == self.threshold_value
-
-        if violation:
+        compare = self._compare
+        if compare is not None and compare(metric_value, self.threshold_value):
             self.current_violations += 1
         else:
             self.current_violations = 0
@@ -241,8 +266,13 @@ class PerformanceMonitor:
         self.enable_system_monitoring = enable_system_monitoring
         self.enable_workflow_profiling = enable_workflow_profiling
 
-        # Metrics storage
-        self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        # Metrics storage, sized to hold one sample per interval over the retention window
+        self._metric_capacity = max(
+            1000, int(metric_retention_hours * 3600 / max(monitoring_interval, 1))
+        )
+        self.metrics: Dict[str, deque] = defaultdict(
+            lambda: deque(maxlen=self._metric_capacity)
+        )
         self.alerts: List[PerformanceAlert] = []
         self.workflow_stats: Dict[str, WorkflowPerformanceStats] = {}
 
@@ -250,8 +280,9 @@ class PerformanceMonitor:
         self.resource_history: deque = deque(maxlen=100)
         self.baseline_metrics: Dict[str, float] = {}
 
-        # Threshold rules
+        # Threshold rules, indexed by metric name for record-time lookup
         self.threshold_rules: List[ThresholdRule] = []
+        self._rules_by_metric: Dict[str, List[ThresholdRule]] = defaultdict(list)
         self._setup_default_thresholds()
 
         # Event handlers
@@ -330,6 +361,50 @@ class PerformanceMonitor:
 
         logfire.debug("Metric recorded", name=name, value=value, type=metric_type.value)
 
+    def record_metric_batch(
+        self,
+        name: str,
+        values: Iterable[Union[int, float]],
+        metric_type: MetricType = MetricType.GAUGE,
+        tags: Optional[Dict[str, str]] = None,
+        unit: str = "",
+        description: str = ""
+    ) -> None:
+        """Record several samples of one metric with a single buffer extend."""
+        timestamp = datetime.utcnow()
+        tags = tags or {}
+
+        batch = [
+            PerformanceMetric(
+                name=name,
+                metric_type=metric_type,
+                value=value,
+                timestamp=timestamp,
+                tags=tags,
+                unit=unit,
+                description=description
+            )
+            for value in values
+        ]
+        if not batch:
+            return
+
+        self.metrics[name].extend(batch)
+
+        # Threshold rules count consecutive violations, so feed samples in order
+        for metric in batch:
+            self._check_thresholds(name, metric.value)
+
+        # Emit to handlers
+        for handler in self.metric_handlers:
+            for metric in batch:
+                try:
+                    handler(metric)
+                except Exception as e:
+                    logfire.error("Metric handler error", handler=str(handler), error=str(e))
+
+        logfire.debug("Metric batch recorded", name=name, count=len(batch), type=metric_type.value)
+
     def start_workflow_profiling(self, context: ExecutionContext) -> None:
         """Start profiling a workflow execution."""
         if not self.enable_workflow_profiling:
@@ -402,6 +477,48 @@ class PerformanceMonitor:
             tags={"execution_id": execution_id}
         )
 
+    def record_step_completion(
+        self,
+        context: ExecutionContext,
+        step_id: int,
+        duration: Optional[timedelta] = None
+    ) -> None:
+        """Mark a step completed and fold it into the workflow stats incrementally."""
+        execution_id = context.execution.execution_id
+        stats = self.workflow_stats.get(execution_id)
+
+        # Incremental update is only valid while stats track every completion
+        in_sync = (
+            stats is not None
+            and step_id not in context.completed_steps
+            and stats.completed_steps == len(context.completed_steps)
+            and stats.failed_steps == len(context.failed_steps)
+        )
+
+        context.mark_step_completed(step_id, duration)
+
+        if stats is None:
+            return
+        if not in_sync:
+            self.update_workflow_progress(context)
+            return
+
+        total_step_time = stats.average_step_duration * stats.completed_steps
+        if duration:
+            total_step_time += duration.total_seconds()
+
+        stats.completed_steps += 1
+        stats.average_step_duration = total_step_time / stats.completed_steps
+        stats.error_rate = stats.failed_steps / (stats.completed_steps + stats.failed_steps)
+
+        # Record progress metric
+        self.record_metric(
+            "workflow_progress",
+            context.get_progress_percentage(),
+            MetricType.GAUGE,
+            tags={"execution_id": execution_id}
+        )
+
     def complete_workflow_profiling(self, context: ExecutionContext) -> WorkflowPerformanceStats:
         """Complete workflow profiling and return final stats."""
         execution_id = context.execution.execution_id
@@ -438,6 +555,7 @@ class PerformanceMonitor:
     def add_threshold_rule(self, rule: ThresholdRule) -> None:
         """Add a performance threshold rule."""
         self.threshold_rules.append(rule)
+        self._rules_by_metric[rule.metric_name].append(rule)
         logfire.info("Threshold rule added", metric=rule.metric_name, threshold=rule.threshold_value)
 
     def add_alert_handler(self, handler: Callable[[PerformanceAlert], None]) -> None:
@@ -462,6 +580,23 @@ class PerformanceMonitor:
         if not metrics:
             return {}
 
+        if NUMPY_AVAILABLE:
+            values = np.fromiter(
+                (m.value for m in metrics), dtype=np.float64, count=len(metrics)
+            )
+            median, p95, p99 = np.percentile(values, [50, 95, 99])
+
+            return {
+                "count": len(values),
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "mean": float(values.mean()),
+                "median": float(median),
+                "std_dev": float(values.std(ddof=1)) if len(values) > 1 else 0,
+                "p95": float(p95),
+                "p99": float(p99)
+            }
+
         values = [m.value for m in metrics]
 
         return {
@@ -589,6 +724,13 @@ class PerformanceMonitor:
 
         return recommendations
 
+    def get_recommendations_by_metric(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Generate performance optimization recommendations, grouped by metric."""
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for recommendation in self.get_performance_recommendations():
+            grouped[recommendation["metric"]].append(recommendation)
+        return dict(grouped)
+
     async def _monitoring_loop(self) -> None:
         """Main monitoring loop."""
         while not self._shutdown_requested:
@@ -676,59 +818,56 @@ class PerformanceMonitor:
 
     def _check_thresholds(self, metric_name: str, value: Union[int, float]) -> None:
         """Check metric value against threshold rules."""
-        for rule in self.threshold_rules:
-            if rule.metric_name == metric_name:
-                if rule.evaluate(value) and rule.should_alert():
-                    alert = PerformanceAlert(
-                        alert_id=f"{metric_name}_{int(time.time())}",
+        for rule in self._rules_by_metric.get(metric_name, ()):
+            if rule.evaluate(value) and rule.should_alert():
+                alert = PerformanceAlert(
+                    alert_id=f"{metric_name}_{int(time.time())}",
+                    metric_name=metric_name,
+                    severity=rule.severity,
+                    message=rule.message_template.format(
                         metric_name=metric_name,
-                        severity=rule.severity,
-                        message=rule.message_template.format(
-                            metric_name=metric_name,
-                            value=value,
-                            threshold=rule.threshold_value
-                        ),
-                        threshold_value=rule.threshold_value,
-                        current_value=value,
-                        timestamp=datetime.utcnow()
-                    )
-
-                    self.alerts.append(alert)
-                    rule.fire_alert()
-
-                    # Emit to handlers
-                    for handler in self.alert_handlers:
-                        try:
-                            handler(alert)
-                        except Exception as e:
-                            logfire.error("Alert handler error", error=str(e))
-
-                    logfire.warning(
-                        "Performance alert triggered",
-                        alert_id=alert.alert_id,
-                        metric=metric_name,
                         value=value,
                         threshold=rule.threshold_value
-                    )
+                    ),
+                    threshold_value=rule.threshold_value,
+                    current_value=value,
+                    timestamp=datetime.utcnow()
+                )
+
+                self.alerts.append(alert)
+                rule.fire_alert()
+
+                # Emit to handlers
+                for handler in self.alert_handlers:
+                    try:
+                        handler(alert)
+                    except Exception as e:
+                        logfire.error("Alert handler error", error=str(e))
+
+                logfire.warning(
+                    "Performance alert triggered",
+                    alert_id=alert.alert_id,
+                    metric=metric_name,
+                    value=value,
+                    threshold=rule.threshold_value
+                )
 
     def _cleanup_old_metrics(self) -> None:
         """Remove old metrics beyond retention period."""
         cutoff_time = datetime.utcnow() - timedelta(hours=self.metric_retention_hours)
 
-        for metric_name in self.metrics:
-            # Filter out old metrics
-            old_count = len(self.metrics[metric_name])
-            self.metrics[metric_name] = deque(
-                [m for m in self.metrics[metric_name] if m.timestamp >= cutoff_time],
-                maxlen=1000
-            )
-            new_count = len(self.metrics[metric_name])
+        for metric_name, metrics in self.metrics.items():
+            # Metrics are appended in time order, so expired ones sit at the left
+            removed_count = 0
+            while metrics and metrics[0].timestamp < cutoff_time:
+                metrics.popleft()
+                removed_count += 1
 
-            if old_count > new_count:
+            if removed_count:
                 logfire.debug(
                     "Cleaned up old metrics",
                     metric_name=metric_name,
-                    removed_count=old_count - new_count
+                    removed_count=removed_count
                 )
 
     def _update_baselines(self) -> None:
@@ -818,6 +957,8 @@ class PerformanceMonitor:
         ]
 
         self.threshold_rules.extend(default_rules)
+        for rule in default_rules:
+            self._rules_by_metric[rule.metric_name].append(rule)
 
     @staticmethod
     def _percentile(values: List[float], percentile: float) -> float:
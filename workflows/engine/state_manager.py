@@ -18,18 +18,33 @@ import asyncio
 import json
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set, Union, Tuple
+from typing import Deque, Dict, Any, List, Optional, Set, Union, Tuple
 from enum import Enum
-from collections import defaultdict
+from collections import defaultdict, deque
 import pickle
 import hashlib
 import logging
+import time
+import zlib
 
 import logfire
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, delete
 from sqlalchemy.orm import selectinload
 
+# Optional dependencies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 from ...core.exceptions import (
     WorkflowError,
     WorkflowExecutionError,
@@ -75,9 +90,52 @@ class CheckpointLevel(Enum):
     DEBUG = "debug"          # All data including internals
 
 
+# Compression level applied to the serialized state of each checkpoint level
+_COMPRESSION_LEVELS: Dict[CheckpointLevel, int] = {
+    CheckpointLevel.MINIMAL: 0,
+    CheckpointLevel.STANDARD: 1,
+    CheckpointLevel.COMPREHENSIVE: 6,
+    CheckpointLevel.DEBUG: 6
+}
+
+
+def _encode_state(state_data: Dict[str, Any]) -> bytes:
+    """Serialize state data to canonical (sorted, compact) JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            state_data,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(
+        state_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode()
+
+
+def _compress_state(raw: bytes, level: int) -> bytes:
+    """Compress serialized state, preferring zstd over zlib."""
+    if level <= 0:
+        return raw
+    if ZSTD_AVAILABLE:
+        return zstandard.ZstdCompressor(level=level).compress(raw)
+    return zlib.compress(raw, level)
+
+
 class StateCheckpoint:
     """Represents a workflow state checkpoint."""
 
+    __slots__ = (
+        "checkpoint_id",
+        "execution_id",
+        "timestamp",
+        "checkpoint_level",
+        "state_data",
+        "metadata",
+        "state_blob",
+        "state_hash",
+        "size_bytes"
+    )
+
     def __init__(
         self,
         checkpoint_id: str,
@@ -85,7 +143,8 @@ class StateCheckpoint:
         timestamp: datetime,
         checkpoint_level: CheckpointLevel,
         state_data: Dict[str, Any],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        compress: bool = True
     ):
         """Initialize state checkpoint."""
         self.checkpoint_id = checkpoint_id
@@ -96,13 +155,15 @@ class StateCheckpoint:
         self.metadata = metadata or {}
 
         # Computed properties
-        self.state_hash = self._compute_hash()
-        self.size_bytes = len(json.dumps(state_data, default=str))
+        raw = _encode_state(state_data)
+        level = _COMPRESSION_LEVELS[checkpoint_level] if compress else 0
+        self.state_blob = _compress_state(raw, level)
+        self.state_hash = hashlib.sha256(raw).hexdigest()
+        self.size_bytes = len(self.state_blob)
 
     def _compute_hash(self) -> str:
         """Compute hash of state data for integrity checking."""
-        state_str = json.dumps(self.state_data, sort_keys=True, default=str)
-        return hashlib.sha256(state_str.encode()).hexdigest()
+        return hashlib.sha256(_encode_state(self.state_data)).hexdigest()
 
     def validate_integrity(self) -> bool:
         """Validate checkpoint integrity."""
@@ -147,7 +208,9 @@ class WorkflowStateManager:
         checkpoint_interval: int = 60,  # seconds
         max_checkpoints_per_execution: int = 100,
         enable_compression: bool = True,
-        cache_size: int = 1000
+        cache_size: int = 1000,
+        flush_threshold: int = 32,
+        max_delta_chain: int = 10
     ):
         """Initialize workflow state manager."""
         self.db_session = db_session
@@ -155,6 +218,8 @@ class WorkflowStateManager:
         self.max_checkpoints_per_execution = max_checkpoints_per_execution
         self.enable_compression = enable_compression
         self.cache_size = cache_size
+        self.flush_threshold = flush_threshold
+        self.max_delta_chain = max_delta_chain
 
         # Repository for database operations
         self.workflow_repo = AsyncWorkflowRepository(db_session)
@@ -168,6 +233,15 @@ class WorkflowStateManager:
         self.checkpoint_tasks: Dict[str, asyncio.Task] = {}
         self.last_checkpoints: Dict[str, datetime] = {}
 
+        # Latest checkpoint holding variables, and delta chain length, per execution
+        self._variable_bases: Dict[str, str] = {}
+        self._delta_depths: Dict[str, int] = {}
+
+        # Checkpoints awaiting a batched write
+        self._pending_checkpoints: Deque[StateCheckpoint] = deque()
+        self._flush_event: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
         # Performance metrics
         self.state_metrics: Dict[str, Any] = {
             "total_checkpoints": 0,
@@ -206,6 +280,11 @@ class WorkflowStateManager:
                 )
                 self.checkpoint_tasks[execution_id] = task
 
+            # Start the batched checkpoint writer
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_event = asyncio.Event()
+                self._flush_task = asyncio.create_task(self._flush_loop())
+
             logfire.info("State management started", execution_id=execution_id)
 
     async def stop_managing_execution(self, execution_id: str, final_checkpoint: bool = True) -> None:
@@ -235,27 +314,77 @@ class WorkflowStateManager:
                 del self.active_executions[execution_id]
             if execution_id in self.last_checkpoints:
                 del self.last_checkpoints[execution_id]
+            self._variable_bases.pop(execution_id, None)
+            self._delta_depths.pop(execution_id, None)
+
+            # Write out pending checkpoints and stop the writer once idle
+            await self.flush()
+            if not self.active_executions:
+                await self._stop_flush_loop()
 
             logfire.info("State management stopped", execution_id=execution_id)
 
+    async def shutdown(self) -> None:
+        """Stop periodic checkpointing and the batched writer, writing out pending checkpoints."""
+        tasks = list(self.checkpoint_tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.checkpoint_tasks.clear()
+
+        await self.flush()
+        await self._stop_flush_loop()
+
+    async def _stop_flush_loop(self) -> None:
+        """Cancel the batched checkpoint writer."""
+        if self._flush_task is None:
+            return
+
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+        self._flush_event = None
+
     async def create_checkpoint(
         self,
         context: ExecutionContext,
         checkpoint_level: CheckpointLevel = CheckpointLevel.STANDARD,
         trigger: str = "manual",
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        incremental: bool = False
     ) -> StateCheckpoint:
-        """Create a state checkpoint for the execution."""
+        """
+        Create a state checkpoint for the execution.
+
+        With ``incremental`` set, variables are stored as a delta against the
+        previous checkpoint instead of in full, up to ``max_delta_chain``
+        consecutive deltas. A full checkpoint is taken instead when the base is
+        no longer cached. Deltas only see changes made through
+        ``set_variable``/``update_variables``; values mutated in place are not
+        picked up, so callers that do so should checkpoint in full.
+        """
         execution_id = context.execution.execution_id
 
         with logfire.span("Create checkpoint", execution_id=execution_id, level=checkpoint_level.value):
             start_time = datetime.utcnow()
+            start_ns = time.perf_counter_ns()
 
             # Generate checkpoint ID
             checkpoint_id = f"{execution_id}_{uuid.uuid4().hex[:8]}"
 
             # Collect state data based on level
-            state_data = await self._collect_state_data(context, checkpoint_level)
+            base_checkpoint_id = None
+            if incremental and self._delta_depths.get(execution_id, 0) < self.max_delta_chain:
+                base_checkpoint_id = self._variable_bases.get(execution_id)
+                if base_checkpoint_id not in self.state_cache:
+                    base_checkpoint_id = None
+            state_data = await self._collect_state_data(
+                context, checkpoint_level, base_checkpoint_id
+            )
 
             # Create checkpoint metadata
             checkpoint_metadata = {
@@ -275,23 +404,34 @@ class WorkflowStateManager:
                 timestamp=start_time,
                 checkpoint_level=checkpoint_level,
                 state_data=state_data,
-                metadata=checkpoint_metadata
+                metadata=checkpoint_metadata,
+                compress=self.enable_compression
             )
 
-            # Persist checkpoint
-            await self._persist_checkpoint(checkpoint)
+            # Queue checkpoint for the next batched write; without a managed execution
+            # running the batched writer, write it out right away
+            self._pending_checkpoints.append(checkpoint)
+            if self._flush_event is None:
+                await self.flush()
+            elif len(self._pending_checkpoints) >= self.flush_threshold:
+                self._flush_event.set()
 
             # Update cache
             self._update_cache(checkpoint)
 
             # Update metrics
             self.state_metrics["total_checkpoints"] += 1
-            checkpoint_time = (datetime.utcnow() - start_time).total_seconds()
+            checkpoint_time = (time.perf_counter_ns() - start_ns) / 1e9
             self._update_average_metric("average_checkpoint_time", checkpoint_time)
             self._update_average_metric("average_checkpoint_size", checkpoint.size_bytes)
 
-            # Update last checkpoint time
+            # Update last checkpoint time and delta chain tracking
             self.last_checkpoints[execution_id] = start_time
+            if checkpoint_level != CheckpointLevel.MINIMAL:
+                self._variable_bases[execution_id] = checkpoint_id
+                self._delta_depths[execution_id] = (
+                    self._delta_depths.get(execution_id, 0) + 1 if base_checkpoint_id else 0
+                )
 
             logfire.info(
                 "Checkpoint created",
@@ -304,6 +444,19 @@ class WorkflowStateManager:
 
             return checkpoint
 
+    async def flush(self) -> int:
+        """Persist all pending checkpoints in a single batch."""
+        if not self._pending_checkpoints:
+            return 0
+
+        batch = list(self._pending_checkpoints)
+        self._pending_checkpoints.clear()
+
+        with logfire.span("Flush checkpoints", count=len(batch)):
+            await self._persist_checkpoints(batch)
+
+        return len(batch)
+
     async def restore_execution(
         self,
         execution_id: str,
@@ -331,6 +484,10 @@ class WorkflowStateManager:
             # Reconstruct execution context
             context = await self._reconstruct_context(execution, workflow, checkpoint)
 
+            # Later deltas must build on the restored state, so the next checkpoint is taken in full
+            self._variable_bases.pop(execution_id, None)
+            self._delta_depths.pop(execution_id, None)
+
             # Update metrics
             self.state_metrics["total_restores"] += 1
 
@@ -356,8 +513,25 @@ class WorkflowStateManager:
         return []
 
     async def delete_checkpoint(self, checkpoint_id: str) -> bool:
-        """Delete a specific checkpoint."""
+        """Delete a specific checkpoint; checkpoints that deltas are based on are kept."""
         try:
+            dependents = [
+                cached.checkpoint_id for cached in self.state_cache.values()
+                if cached.state_data.get("base_checkpoint_id") == checkpoint_id
+            ]
+            if dependents:
+                logfire.warning(
+                    "Checkpoint is the base of delta checkpoints, not deleted",
+                    checkpoint_id=checkpoint_id,
+                    dependents=dependents
+                )
+                return False
+
+            # Later deltas must not be based on a deleted checkpoint
+            for execution_id, base_checkpoint_id in list(self._variable_bases.items()):
+                if base_checkpoint_id == checkpoint_id:
+                    del self._variable_bases[execution_id]
+
             # Remove from cache
             if checkpoint_id in self.state_cache:
                 del self.state_cache[checkpoint_id]
@@ -404,7 +578,8 @@ class WorkflowStateManager:
                             "migrated_from": source_version.value,
                             "migrated_to": target_version.value,
                             "original_checkpoint": checkpoint.checkpoint_id
-                        }
+                        },
+                        compress=self.enable_compression
                     )
 
                     await self._persist_checkpoint(migrated_checkpoint)
@@ -468,7 +643,8 @@ class WorkflowStateManager:
     async def _collect_state_data(
         self,
         context: ExecutionContext,
-        level: CheckpointLevel
+        level: CheckpointLevel,
+        base_checkpoint_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Collect state data based on checkpoint level."""
         base_data = {
@@ -483,8 +659,17 @@ class WorkflowStateManager:
         }
 
         if level in [CheckpointLevel.STANDARD, CheckpointLevel.COMPREHENSIVE, CheckpointLevel.DEBUG]:
+            changed, removed = context.take_variable_changes()
+            if base_checkpoint_id:
+                base_data.update({
+                    "base_checkpoint_id": base_checkpoint_id,
+                    "variables_delta": changed,
+                    "variables_removed": removed
+                })
+            else:
+                base_data["variables"] = dict(context.variables)
+
             base_data.update({
-                "variables": context.variables,
                 "step_results": context.step_results,
                 "output_data": context.output_data
             })
@@ -512,14 +697,37 @@ class WorkflowStateManager:
 
     async def _persist_checkpoint(self, checkpoint: StateCheckpoint) -> None:
         """Persist checkpoint to database."""
-        # Implementation would save checkpoint to database
+        await self._persist_checkpoints([checkpoint])
+
+    async def _persist_checkpoints(self, checkpoints: List[StateCheckpoint]) -> None:
+        """Persist a batch of checkpoints to database with a single commit."""
+        # Implementation would insert all rows in one execute and commit once
         # For now, just log the operation
         logfire.debug(
-            "Persisting checkpoint",
-            checkpoint_id=checkpoint.checkpoint_id,
-            size_bytes=checkpoint.size_bytes
+            "Persisting checkpoints",
+            checkpoint_ids=[checkpoint.checkpoint_id for checkpoint in checkpoints],
+            size_bytes=sum(checkpoint.size_bytes for checkpoint in checkpoints)
         )
 
+    async def _flush_loop(self) -> None:
+        """Flush pending checkpoints when the threshold is hit or the interval elapses."""
+        timeout = self.checkpoint_interval if self.checkpoint_interval > 0 else None
+
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._flush_event.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_event.clear()
+                await self.flush()
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logfire.error("Checkpoint flush failed", error=str(e))
+                await asyncio.sleep(5)  # Brief delay before retry
+
     async def _find_restore_checkpoint(
         self,
         execution_id: str,
@@ -556,12 +764,13 @@ class WorkflowStateManager:
     ) -> ExecutionContext:
         """Reconstruct execution context from checkpoint data."""
         state_data = checkpoint.state_data
+        variables = self._resolve_variables(state_data)
 
         # Create basic context
         context = ExecutionContext(
             execution=execution,
             workflow=workflow,
-            input_data=state_data.get("variables", {}),
+            input_data=variables,
             config=state_data.get("global_context", {})
         )
 
@@ -572,7 +781,7 @@ class WorkflowStateManager:
         context.completed_steps = set(state_data.get("completed_steps", []))
         context.failed_steps = set(state_data.get("failed_steps", []))
         context.skipped_steps = set(state_data.get("skipped_steps", []))
-        context.variables = state_data.get("variables", {})
+        context.variables = variables
         context.step_results = state_data.get("step_results", {})
         context.output_data = state_data.get("output_data", {})
 
@@ -585,6 +794,27 @@ class WorkflowStateManager:
 
         return context
 
+    def _resolve_variables(self, state_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild full variables by replaying a delta checkpoint chain."""
+        deltas = []
+        while "base_checkpoint_id" in state_data:
+            deltas.append(state_data)
+            base_checkpoint_id = state_data["base_checkpoint_id"]
+            base = self.state_cache.get(base_checkpoint_id)
+            if base is None:
+                raise WorkflowExecutionError(
+                    f"Base checkpoint {base_checkpoint_id} not available for delta restore"
+                )
+            state_data = base.state_data
+
+        variables = dict(state_data.get("variables", {}))
+        for delta in reversed(deltas):
+            variables.update(delta["variables_delta"])
+            for key in delta["variables_removed"]:
+                variables.pop(key, None)
+
+        return variables
+
     async def _migrate_checkpoint_data(
         self,
         data: Dict[str, Any],
@@ -610,7 +840,8 @@ class WorkflowStateManager:
                 if execution_id not in self.active_executions:
                     break
 
-                # Check if execution is still active and making progress
+                # Check if execution is still active and making progress. Periodic
+                # checkpoints stay full: delta bases can't be loaded back from the database yet
                 if not context.is_paused and not context.is_cancelled:
                     await self.create_checkpoint(
                         context,
@@ -636,8 +867,15 @@ class WorkflowStateManager:
 
         # Evict old entries if cache is full
         if len(self.state_cache) > self.cache_size:
-            # Remove oldest accessed checkpoint
-            oldest_id = min(self.cache_access_times.items(), key=lambda x: x[1])[0]
+            # Remove the oldest accessed checkpoint that no cached delta is based on; the
+            # newest checkpoint of every chain qualifies, so there is always a candidate
+            bases = {
+                cached.state_data.get("base_checkpoint_id") for cached in self.state_cache.values()
+            }
+            oldest_id = min(
+                (item for item in self.cache_access_times.items() if item[0] not in bases),
+                key=lambda x: x[1]
+            )[0]
             del self.state_cache[oldest_id]
             del self.cache_access_times[oldest_id]
 
@@ -86,6 +86,14 @@ class WorkflowEngine:
         self._execution_contexts: Dict[str, ExecutionContext] = {}
         self._execution_tasks: Dict[str, asyncio.Task] = {}
 
+        # Admission control for concurrent executions; the semaphore is created on the
+        # running loop by start() or the first execution
+        self._admission: Optional[asyncio.Semaphore] = None
+        self._admitted: Set[str] = set()
+
+        # Set once an execution's task has started running
+        self._admitted_events: Dict[str, asyncio.Event] = {}
+
         # Step executor for individual step processing
         self.step_executor = StepExecutor(db_session)
 
@@ -127,10 +135,17 @@ class WorkflowEngine:
 
     async def start(self) -> None:
         """Start the workflow engine and all subsystems."""
+        self._get_admission()
         await self.multi_agent_coordinator.start()
         await self.performance_monitor.start()
         logfire.info("Workflow engine started")
 
+    def _get_admission(self) -> asyncio.Semaphore:
+        """Return the admission semaphore, creating it on first use."""
+        if self._admission is None:
+            self._admission = asyncio.Semaphore(self.max_concurrent_workflows)
+        return self._admission
+
     def _register_default_handlers(self) -> None:
         """Register default workflow type handlers."""
         self._workflow_handlers[WorkflowType.MULTI_AGENT] = self._handle_multi_agent_workflow
@@ -191,16 +206,23 @@ class WorkflowEngine:
                     f"Workflow {workflow_id} is not active (status: {workflow.status.value})"
                 )
 
-            # Check concurrent execution limit
-            if len(self._active_executions) >= self.max_concurrent_workflows:
+            # Check concurrent execution limit; the slot is held until cleanup
+            admission = self._get_admission()
+            if admission.locked():
                 raise WorkflowExecutionError(
                     "Maximum concurrent workflow executions reached"
                 )
+            await admission.acquire()
 
             # Create execution record
-            execution = await self._create_execution(
-                workflow, input_data, execution_config
-            )
+            try:
+                execution = await self._create_execution(
+                    workflow, input_data, execution_config
+                )
+            except BaseException:
+                admission.release()
+                raise
+            self._admitted.add(execution.execution_id)
 
             # Create execution context
             context = ExecutionContext(
@@ -222,6 +244,7 @@ class WorkflowEngine:
             self.performance_monitor.start_workflow_profiling(context)
 
             # Start execution task
+            self._admitted_events[execution_id] = asyncio.Event()
             task = asyncio.create_task(
                 self._execute_workflow_async(context)
             )
@@ -255,7 +278,7 @@ class WorkflowEngine:
         )
 
         # Save to database
-        await self.workflow_repo.db_session.add(execution)
+        self.workflow_repo.db_session.add(execution)
         await self.workflow_repo.db_session.commit()
         await self.workflow_repo.db_session.refresh(execution)
 
@@ -267,6 +290,10 @@ class WorkflowEngine:
         workflow = context.workflow
         execution_id = execution.execution_id
 
+        admitted = self._admitted_events.get(execution_id)
+        if admitted is not None:
+            admitted.set()
+
         try:
             with logfire.span(
                 "Workflow execution",
@@ -313,11 +340,7 @@ class WorkflowEngine:
         self.performance_monitor.record_metric(
             "active_executions",
             len(self._active_executions),
-            tags={"workflow_id": str(context.workflow.id)}
-        )
-            execution.id,
-            ExecutionStatus.RUNNING,
-            {}
+            tags={"workflow_id": str(execution.workflow_id)}
         )
 
         logfire.info(
@@ -332,8 +355,7 @@ class WorkflowEngine:
         output_data: Dict[str, Any]
     ) -> None:
         """Complete workflow execution successfully."""
-        execution.complete_execution()
-        execution.output_data = output_data
+        execution.complete_execution(True, output_data)
 
         await self.workflow_repo.update_execution_state(
             execution.id,
@@ -371,6 +393,12 @@ class WorkflowEngine:
         """Clean up execution tracking data."""
         self._active_executions.pop(execution_id, None)
         self._execution_contexts.pop(execution_id, None)
+        self._admitted_events.pop(execution_id, None)
+
+        # Free the admission slot
+        if execution_id in self._admitted:
+            self._admitted.discard(execution_id)
+            self._admission.release()
 
         # Clean up task
         task = self._execution_tasks.pop(execution_id, None)
@@ -399,7 +427,7 @@ class WorkflowEngine:
                 task.cancel()
 
             # Update execution status
-            execution.complete_execution()
+            execution.cancel_execution()
             await self.workflow_repo.update_execution(execution)
 
             # Record completion metrics
@@ -407,11 +435,7 @@ class WorkflowEngine:
             self.performance_monitor.record_metric(
                 "workflow_execution_duration",
                 duration,
-                tags={"workflow_id": str(context.workflow.id), "execution_id": execution.execution_id}
-            )
-                execution.id,
-                ExecutionStatus.CANCELLED,
-                {}
+                tags={"workflow_id": str(execution.workflow_id), "execution_id": execution.execution_id}
             )
 
             # Clean up
@@ -524,131 +548,136 @@ class WorkflowEngine:
                 return_exceptions=True
             )
 
+        # Write out any checkpoints still waiting for a batch and stop background loops
+        await self.state_manager.shutdown()
+        await self.multi_agent_coordinator.shutdown()
+        await self.performance_monitor.stop()
+
         logfire.info("Workflow engine shutdown completed")
 
     async def _handle_multi_agent_workflow(self, context: ExecutionContext) -> Dict[str, Any]:
-    """Handle multi-agent workflow execution."""
-    with logfire.span("Multi-agent workflow", execution_id=context.execution.execution_id):
-        results = {}
-
-        for step in context.workflow.steps:
-            if not context.can_execute_step(step):
-                continue
-
-            # Update progress metrics
-            self.performance_monitor.update_workflow_progress(context)
-
-            # Determine coordination strategy from step config
-            step_config = step.configuration or {}
-            strategy_name = step_config.get("coordination_strategy", "parallel")
-            strategy = CoordinationStrategy(strategy_name)
-
-            # Execute step with multi-agent coordination
-            step_result = await self.multi_agent_coordinator.execute_multi_agent_step(
-                step=step,
-                context=context,
-                strategy=strategy
-            )
+        """Handle multi-agent workflow execution."""
+        with logfire.span("Multi-agent workflow", execution_id=context.execution.execution_id):
+            results = {}
+
+            for step in context.workflow.steps:
+                if not context.can_execute_step(step):
+                    continue
+
+                # Update progress metrics
+                self.performance_monitor.update_workflow_progress(context)
+
+                # Determine coordination strategy from step config
+                step_config = step.configuration or {}
+                strategy_name = step_config.get("coordination_strategy", "parallel")
+                strategy = CoordinationStrategy(strategy_name)
+
+                # Execute step with multi-agent coordination
+                step_result = await self.multi_agent_coordinator.execute_multi_agent_step(
+                    step=step,
+                    context=context,
+                    strategy=strategy
+                )
 
-            # Store result and mark step as completed
-            context.set_step_result(step.id, step_result)
-            context.mark_step_completed(step.id)
-            results[f"step_{step.id}"] = step_result
+                # Store result and mark step as completed
+                context.set_step_result(step.id, step_result)
+                context.mark_step_completed(step.id)
+                results[f"step_{step.id}"] = step_result
 
-            # Update context variables with step result
-            if isinstance(step_result, dict):
-                context.variables.update(step_result)
+                # Update context variables with step result
+                if isinstance(step_result, dict):
+                    context.update_variables(step_result)
 
-        return results
+            return results
 
     async def _handle_sequential_workflow(self, context: ExecutionContext) -> Dict[str, Any]:
-    """Handle sequential workflow execution."""
-    return await self._execute_steps_sequential(context)
+        """Handle sequential workflow execution."""
+        return await self._execute_steps_sequential(context)
 
     async def _handle_parallel_workflow(self, context: ExecutionContext) -> Dict[str, Any]:
-    """Handle parallel workflow execution."""
-    with logfire.span("Parallel workflow", execution_id=context.execution.execution_id):
-        # Execute all independent steps in parallel
-        tasks = []
-        step_map = {}
-
-        for step in context.workflow.steps:
-            if context.can_execute_step(step):
-                task = asyncio.create_task(self._execute_single_step(step, context))
-                tasks.append(task)
-                step_map[task] = step
-
-        # Wait for all parallel steps to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Process results
-        workflow_results = {}
-        for task, result in zip(tasks, results):
-            step = step_map[task]
-
-            if isinstance(result, Exception):
-                context.mark_step_failed(step.id, str(result))
-                logfire.error("Parallel step failed", step_id=step.id, error=str(result))
-            else:
-                context.set_step_result(step.id, result)
-                context.mark_step_completed(step.id)
-                workflow_results[f"step_{step.id}"] = result
-
-        return workflow_results
+        """Handle parallel workflow execution."""
+        with logfire.span("Parallel workflow", execution_id=context.execution.execution_id):
+            # Execute all independent steps in parallel
+            tasks = []
+            step_map = {}
+
+            for step in context.workflow.steps:
+                if context.can_execute_step(step):
+                    task = asyncio.create_task(self._execute_single_step(step, context))
+                    tasks.append(task)
+                    step_map[task] = step
+
+            # Wait for all parallel steps to complete
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Process results
+            workflow_results = {}
+            for task, result in zip(tasks, results):
+                step = step_map[task]
+
+                if isinstance(result, Exception):
+                    context.mark_step_failed(step.id, str(result))
+                    logfire.error("Parallel step failed", step_id=step.id, error=str(result))
+                else:
+                    context.set_step_result(step.id, result)
+                    context.mark_step_completed(step.id)
+                    workflow_results[f"step_{step.id}"] = result
+
+            return workflow_results
 
     async def _handle_pipeline_workflow(self, context: ExecutionContext) -> Dict[str, Any]:
-    """Handle pipeline workflow execution."""
-    with logfire.span("Pipeline workflow", execution_id=context.execution.execution_id):
-        # Execute steps in pipeline mode with multi-agent coordination
-        pipeline_result = await self.multi_agent_coordinator.execute_multi_agent_step(
-            step=context.workflow.steps[0] if context.workflow.steps else None,
-            context=context,
-            strategy=CoordinationStrategy.PIPELINE
-        )
+        """Handle pipeline workflow execution."""
+        with logfire.span("Pipeline workflow", execution_id=context.execution.execution_id):
+            # Execute steps in pipeline mode with multi-agent coordination
+            pipeline_result = await self.multi_agent_coordinator.execute_multi_agent_step(
+                step=context.workflow.steps[0] if context.workflow.steps else None,
+                context=context,
+                strategy=CoordinationStrategy.PIPELINE
+            )
 
-        return {"pipeline_result": pipeline_result}
+            return {"pipeline_result": pipeline_result}
 
     async def _execute_steps_sequential(self, context: ExecutionContext) -> Dict[str, Any]:
-    """Execute workflow steps sequentially."""
-    results = {}
+        """Execute workflow steps sequentially."""
+        results = {}
 
-    for step in context.workflow.steps:
-        if not context.can_execute_step(step):
-            context.mark_step_skipped(step.id, "Dependencies not met")
-            continue
+        for step in context.workflow.steps:
+            if not context.can_execute_step(step):
+                context.mark_step_skipped(step.id, "Dependencies not met")
+                continue
 
-        step_result = await self._execute_single_step(step, context)
-        context.set_step_result(step.id, step_result)
-        context.mark_step_completed(step.id)
-        results[f"step_{step.id}"] = step_result
+            step_result = await self._execute_single_step(step, context)
+            context.set_step_result(step.id, step_result)
+            context.mark_step_completed(step.id)
+            results[f"step_{step.id}"] = step_result
 
-        # Update context variables
-        if isinstance(step_result, dict):
-            context.variables.update(step_result)
+            # Update context variables
+            if isinstance(step_result, dict):
+                context.update_variables(step_result)
 
-    return results
+        return results
 
     async def _execute_single_step(self, step: WorkflowStep, context: ExecutionContext) -> Any:
-    """Execute a single workflow step."""
-    with logfire.span("Step execution", step_id=step.id, step_type=step.step_type.value):
-        step_config = step.configuration or {}
+        """Execute a single workflow step."""
+        with logfire.span("Step execution", step_id=step.id, step_type=step.step_type.value):
+            step_config = step.configuration or {}
 
-        # Check if step requires multi-agent coordination
-        requires_multi_agent = step_config.get("multi_agent", False) or step.step_type == StepType.AGENT_TASK
+            # Check if step requires multi-agent coordination
+            requires_multi_agent = step_config.get("multi_agent", False) or step.step_type == StepType.AGENT_TASK
 
-        if requires_multi_agent:
-            # Use multi-agent coordinator
-            strategy_name = step_config.get("coordination_strategy", "parallel")
-            strategy = CoordinationStrategy(strategy_name)
+            if requires_multi_agent:
+                # Use multi-agent coordinator
+                strategy_name = step_config.get("coordination_strategy", "parallel")
+                strategy = CoordinationStrategy(strategy_name)
 
-            return await self.multi_agent_coordinator.execute_multi_agent_step(
-                step=step,
-                context=context,
-                strategy=strategy
-            )
-        else:
-            # Use step executor for single-agent or non-agent steps
-            return await self.step_executor.execute_step(step, context)
+                return await self.multi_agent_coordinator.execute_multi_agent_step(
+                    step=step,
+                    context=context,
+                    strategy=strategy
+                )
+            else:
+                # Use step executor for single-agent or non-agent steps
+                return await self.step_executor.execute_step(step, context)
 
     async def pause_execution(self, execution_id: str) -> bool:
         """Pause a workflow execution with state checkpoint."""